@@ -0,0 +1,53 @@
+import streamlit as st
+
+import analysis_store
+import batch_analysis
+import data_plane
+import request_queue
+import response_cache
+import trade_data
+from chat_component import render_stock_chat, DEFAULT_TIMEOUT
+
+# -----------------------------
+# AI ANALYST PAGE
+# Imported only when selected - this is what pulls in openai
+# -----------------------------
+
+
+def render():
+    """Render the AI Analyst page"""
+    api_key = st.secrets["aikey"]["api_key"]
+    model = "gpt-4o-mini"
+
+    # Chat box at the bottom
+    if api_key:       
+        ai_config = st.secrets["aikey"]
+        request_queue.get_queue(
+            concurrency=ai_config.get("queue_concurrency"),
+            user_rpm=ai_config.get("user_rpm"),
+            model_rpm=ai_config.get("model_rpm"),
+            max_attempts=ai_config.get("max_attempts"),
+        )
+        render_stock_chat(
+            api_key, model,
+            stream=ai_config.get("stream", True),
+            base_url=ai_config.get("base_url"),
+            timeout=ai_config.get("timeout", DEFAULT_TIMEOUT),
+            cache_ttl=ai_config.get("cache_ttl", response_cache.DEFAULT_TTL),
+        )
+
+        # Default batch: every stock in the live positions sheet
+        try:
+            portfolio = data_plane.acquire("live", lambda: trade_data.load_live(st.secrets["data"]["csv_live_url"], ttl=st.secrets["data"].get("cache_ttl", trade_data.DEFAULT_TTL)))
+            portfolio_tickers = portfolio["Stock"].dropna().unique().tolist()
+        except Exception:
+            portfolio_tickers = []
+        batch_analysis.render_batch_panel(
+            api_key, model, portfolio_tickers, user=st.session_state.get("username"),
+            cache_ttl=ai_config.get("cache_ttl", response_cache.DEFAULT_TTL),
+            base_url=ai_config.get("base_url"),
+            timeout=ai_config.get("timeout", DEFAULT_TIMEOUT),
+        )
+        analysis_store.render_history_panel()
+    else:
+        st.info("👈 Subscribe to Plan")
@@ -0,0 +1,205 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+import chat_context
+import response_cache
+
+# -----------------------------
+# PAST ANALYSES STORE
+# Typed fields parsed from AI answers, kept in SQLite so past
+# analyses can be screened and charted without re-asking the model
+# -----------------------------
+
+STORE_PATH = os.path.join(".cache", "analyses.sqlite3")
+
+# Column -> (answer field, kind)
+FIELDS = {
+    "pe": ("P/E Ratio", "number"),
+    "roe": ("ROE", "number"),
+    "debt_equity": ("Debt/Equity", "number"),
+    "call": ("Call", "text"),
+    "target": ("Target (12M)", "number"),
+    "stop_loss": ("Stop Loss", "number"),
+    "risk_reward": ("Risk-Reward", "ratio"),
+}
+
+COLUMNS = [
+    "ticker", "company", "created_at", "model", "price", "pe", "roe", "debt_equity",
+    "call", "entry_low", "entry_high", "target", "stop_loss", "risk_reward", "question", "response",
+]
+
+_NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+_HEADLINE = re.compile(r"\*\*(.+?)\s*-\s*Current Price:\s*([^*\n]+)\*\*")
+
+
+def _number(text):
+    """First number in a cell ("₹2,400" -> 2400.0, "12%" -> 12.0), or None"""
+    match = _NUMBER.search(text or "")
+    return float(match.group().replace(",", "")) if match else None
+
+
+def _ratio(text):
+    """Reward side of "1:2.5" -> 2.5"""
+    if text and ":" in text:
+        return _number(text.split(":", 1)[1])
+    return _number(text)
+
+
+def parse_analysis(text):
+    """
+    Extract the typed fields of an answer in the system-prompt format
+
+    Returns:
+        dict with company, price, entry_low/high and the FIELDS columns,
+        or None when the text has no recognizable analysis tables
+    """
+    fields = chat_context.answer_fields(text)
+    if "Call" not in fields:
+        return None
+
+    headline = _HEADLINE.search(text)
+    record = {
+        "company": headline.group(1).strip() if headline else None,
+        "price": _number(headline.group(2)) if headline else None,
+    }
+    for column, (name, kind) in FIELDS.items():
+        value = fields.get(name)
+        if kind == "number":
+            record[column] = _number(value)
+        elif kind == "ratio":
+            record[column] = _ratio(value)
+        else:
+            record[column] = value.strip() if value else None
+
+    zone = [_number(part) for part in (fields.get("Entry Zone") or "").split("-")]
+    record["entry_low"] = zone[0] if zone else None
+    record["entry_high"] = zone[-1] if zone else None
+    return record
+
+
+class AnalysisStore:
+    """SQLite table of parsed analyses, indexed on (ticker, created_at)"""
+
+    def __init__(self, path=STORE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " ticker TEXT NOT NULL, company TEXT, created_at REAL NOT NULL, model TEXT,"
+            " price REAL, pe REAL, roe REAL, debt_equity REAL, call TEXT,"
+            " entry_low REAL, entry_high REAL, target REAL, stop_loss REAL, risk_reward REAL,"
+            " question TEXT, response TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_ticker_time ON analyses (ticker, created_at)")
+        self._db.commit()
+
+    def save(self, response, question, model, ticker=None):
+        """
+        Parse an answer and store it
+
+        Args:
+            response: AI answer text
+            question: Question that produced it
+            model: Model used
+            ticker: Ticker (the answer's company name when omitted, else
+                the stock named in the question)
+
+        Returns:
+            The stored record, or None when the answer could not be parsed
+        """
+        record = parse_analysis(response)
+        if record is None:
+            return None
+        if ticker is None:
+            ticker = (record["company"] or "").upper()
+        if not ticker:
+            normalized = response_cache.normalize_question(question)
+            ticker = " vs ".join(normalized[0]) if normalized else ""
+        record.update(ticker=ticker, created_at=time.time(), model=model, question=question, response=response)
+
+        with self._lock:
+            self._db.execute(
+                f"INSERT INTO analyses ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [record[column] for column in COLUMNS],
+            )
+            self._db.commit()
+        return record
+
+    def query(self, ticker=None, since=None, limit=500):
+        """
+        Past analyses, newest first
+
+        Args:
+            ticker: Only this ticker
+            since: Only analyses after this Unix time
+            limit: Max rows
+
+        Returns:
+            DataFrame with COLUMNS (created_at as datetime)
+        """
+        where, params = [], []
+        if ticker:
+            where.append("ticker = ?")
+            params.append(ticker)
+        if since:
+            where.append("created_at > ?")
+            params.append(since)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM analyses"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            frame = pd.read_sql_query(sql, self._db, params=params)
+        frame["created_at"] = pd.to_datetime(frame["created_at"], unit="s")
+        return frame
+
+    def tickers(self):
+        """Distinct tickers with stored analyses"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT ticker FROM analyses ORDER BY ticker")]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=STORE_PATH):
+    """Process-wide AnalysisStore for a path (shared across sessions)"""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = AnalysisStore(path)
+        return _stores[path]
+
+
+def render_history_panel():
+    """AI Analyst page panel: screen and chart stored analyses"""
+    store = get_store()
+    with st.expander("📚 Past Analyses"):
+        tickers = store.tickers()
+        if not tickers:
+            st.caption("No analyses saved yet")
+            return
+
+        ticker = st.selectbox("Ticker", ["All"] + tickers, key="history_ticker")
+        history = store.query(None if ticker == "All" else ticker)
+        st.dataframe(
+            history.drop(columns=["question", "response"]),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "created_at": st.column_config.DatetimeColumn("Analysed", format="YYYY-MM-DD HH:mm"),
+                "risk_reward": st.column_config.NumberColumn("Risk-Reward", format="1:%.1f"),
+            },
+        )
+        if ticker != "All" and len(history) > 1:
+            st.line_chart(history.set_index("created_at")[["price", "target", "stop_loss"]].sort_index())
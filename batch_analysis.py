@@ -0,0 +1,170 @@
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+import analysis_store
+import chat_context
+import request_queue
+import response_cache
+import trade_data
+from chat_component import SYSTEM_PROMPT, analyze_stock
+
+# -----------------------------
+# BATCH / MULTI-TICKER ANALYSIS
+# Concurrent fan-out of analyze_stock over many tickers,
+# from the AI Analyst page or the command line
+# -----------------------------
+
+DEFAULT_WORKERS = 4
+
+COMPARISON_FIELDS = [
+    "Call", "Entry Zone", "Target (12M)", "Stop Loss", "Risk-Reward",
+    "P/E Ratio", "ROE", "Debt/Equity", "Valuation",
+]
+
+_PRICE = re.compile(r"Current Price:\s*([^*\n]+)")
+
+
+def _question(ticker):
+    return f"Analyze {ticker}"
+
+
+def _result(ticker, response, cached, failed=False):
+    """Structured row for one ticker's answer"""
+    fields = {} if failed else chat_context.answer_fields(response)
+    price = None if failed else _PRICE.search(response)
+    row = {"Ticker": ticker, "Price": price.group(1).strip() if price else None}
+    row.update({name: fields.get(name) for name in COMPARISON_FIELDS})
+    row["Cached"] = cached
+    row["Error"] = response if failed else None
+    row["Response"] = response
+    return row
+
+
+def analyze_batch(tickers, api_key, model="gpt-4o-mini", max_workers=DEFAULT_WORKERS,
+                  user=None, cache=None, cache_ttl=response_cache.DEFAULT_TTL, store=None, **client_options):
+    """
+    Analyze many tickers concurrently
+
+    Each ticker is asked as a standalone "Analyze <ticker>" question (no chat
+    history). Answers already in the response cache are reused; new ones
+    are saved to the analysis store when given. Requests go through
+    request_queue, so they count against the user's and the model's rate
+    limits like chat questions do.
+
+    Args:
+        tickers: Iterable of ticker names (duplicates/blanks are dropped)
+        api_key: OpenAI API key
+        model: Model to use
+        max_workers: Concurrent requests
+        user: Per-user rate limit key for the request queue (None for none)
+        cache: Optional response_cache.ResponseCache
+        cache_ttl: Seconds a cached answer is reused
+        store: Optional analysis_store.AnalysisStore
+        **client_options: base_url / timeout for get_client
+
+    Returns:
+        List of result dicts (see COMPARISON_FIELDS), in input order
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+
+    def run(ticker):
+        key = response_cache.make_key(_question(ticker), model, SYSTEM_PROMPT) if cache and cache_ttl > 0 else None
+        cached = cache.get(key, ttl=cache_ttl) if key else None
+        if cached is not None:
+            return _result(ticker, cached, True)
+
+        usage = {}
+        response = analyze_stock(_question(ticker), api_key, model, history=[], usage=usage, user=user, **client_options)
+        failed = "error" in usage
+        if not failed:
+            if key:
+                cache.put(key, response, ttl=cache_ttl)
+            if store:
+                store.save(response, _question(ticker), model, ticker=ticker)
+        return _result(ticker, response, False, failed)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, tickers))
+
+
+def comparison_table(results):
+    """One row per ticker with the key fields, for display or export"""
+    columns = ["Ticker", "Price"] + COMPARISON_FIELDS + ["Cached", "Error"]
+    return pd.DataFrame(results, columns=columns + ["Response"])[columns]
+
+
+def render_batch_panel(api_key, model, tickers=(), user=None, cache_ttl=response_cache.DEFAULT_TTL, **client_options):
+    """
+    AI Analyst page panel: analyze a list of tickers and show one comparison table
+
+    Args:
+        api_key: OpenAI API key
+        model: Model to use
+        tickers: Default tickers (e.g. the Live Position stocks)
+        user: Per-user rate limit key (the logged-in username)
+        cache_ttl: Seconds a cached answer is reused (0 disables the cache)
+        **client_options: base_url / timeout for get_client
+    """
+    with st.expander("📋 Batch Analysis"):
+        text = st.text_area("Tickers (comma or newline separated)", ", ".join(tickers), key="batch_tickers")
+        if st.button("Analyze All", use_container_width=True):
+            batch = [t for t in re.split(r"[,\n]", text) if t.strip()]
+            with st.spinner(f"Analyzing {len(batch)} tickers..."):
+                results = analyze_batch(
+                    batch, api_key, model, user=user,
+                    cache=response_cache.get_cache() if cache_ttl > 0 else None, cache_ttl=cache_ttl, store=analysis_store.get_store(), **client_options
+                )
+            st.session_state.batch_results = comparison_table(results)
+
+        if "batch_results" in st.session_state:
+            st.dataframe(st.session_state.batch_results, hide_index=True, use_container_width=True)
+
+
+def main(argv=None):
+    """CLI entry point for overnight runs: python batch_analysis.py TCS INFY --out results.csv"""
+    parser = argparse.ArgumentParser(description="Analyze many tickers with the AI Analyst and write a comparison table.")
+    parser.add_argument("tickers", nargs="*", help="Tickers to analyze")
+    parser.add_argument("--live-url", help="Also analyze every Stock in the live-position CSV at this URL")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rpm", type=int, default=request_queue.DEFAULT_MODEL_RPM, help="Max requests per minute")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"))
+    parser.add_argument("--base-url", default=os.environ.get("OPENAI_BASE_URL"))
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the response cache")
+    parser.add_argument("--out", help="Write the table to this .csv or .parquet file")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.live_url:
+        tickers += trade_data.load_live(args.live_url)["Stock"].dropna().tolist()
+    if not tickers:
+        parser.error("no tickers given")
+    if not args.api_key:
+        parser.error("set OPENAI_API_KEY or pass --api-key")
+
+    request_queue.get_queue(concurrency=args.workers, model_rpm=args.rpm)
+    results = analyze_batch(
+        tickers, args.api_key, args.model,
+        max_workers=args.workers,
+        cache=None if args.no_cache else response_cache.get_cache(),
+        store=analysis_store.get_store(),
+        base_url=args.base_url,
+    )
+    table = comparison_table(results)
+    if args.out:
+        if args.out.endswith(".parquet"):
+            table.to_parquet(args.out, index=False)
+        else:
+            table.to_csv(args.out, index=False)
+    print(table.drop(columns=["Error"]).to_string(index=False))
+    return 1 if table["Error"].notna().any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
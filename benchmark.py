@@ -0,0 +1,318 @@
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import equity_analytics
+import filter_index
+import kpi_cube
+import live_refresh
+import trade_data
+
+# -----------------------------
+# BENCHMARK HARNESS
+# Synthetic trade / live-position sheets served over local HTTP,
+# timing the Dashboard and Live Position code paths
+# -----------------------------
+
+DEFAULT_TRADE_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_LIVE_SIZES = [100, 1_000]
+DEFAULT_REPEAT = 3
+
+STRATEGIES = ["RHS", "Breakout", "Swing", "Momentum", "Pullback", "Positional", "BTST", "Value"]
+PLATFORMS = ["Groww", "Zerodha", "Upstox", "Angel One", "Dhan"]
+MARKET_CAPS = ["Large Cap", "Mid Cap", "Small Cap"]
+SCRIPT_COUNT = 500
+CAPITAL = 900000
+
+
+def _scripts(rng, count):
+    """`count` distinct random 3-9 letter names (drawn until there are enough)"""
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    names = {}
+    while len(names) < count:
+        names.setdefault("".join(rng.choice(letters, size=rng.integers(3, 10))), None)
+    return list(names)
+
+
+def synthetic_trades(rows, seed=0):
+    """
+    Trade-history CSV export shaped like the real sheet
+
+    Two title rows, then the TRADE_SCHEMA columns plus a NOTES column;
+    amounts formatted with ₹ and thousands separators, dates as 25-May-2024.
+
+    Returns:
+        CSV bytes
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2021-01-01", "2025-12-31", freq="D")
+    day_labels = pd.Index(days.strftime("%d-%b-%Y"))
+
+    entry = rng.integers(0, len(days) - 120, size=rows)
+    exit_ = entry + rng.integers(1, 120, size=rows)
+    invested = rng.uniform(5_000, 200_000, size=rows).round(2)
+    pct = rng.normal(1.5, 8.0, size=rows).round(2)
+    profit = (invested * pct / 100).round(2)
+    # Weighted so some strategies/platforms dominate, like real usage
+    strategy_p = rng.dirichlet(np.ones(len(STRATEGIES)))
+    platform_p = rng.dirichlet(np.ones(len(PLATFORMS)))
+
+    frame = pd.DataFrame({
+        "ENTRY DATE": pd.Categorical.from_codes(entry, day_labels),
+        "EXIT DATE": pd.Categorical.from_codes(exit_, day_labels),
+        "SCRIPT": pd.Categorical.from_codes(rng.integers(0, SCRIPT_COUNT, size=rows), _scripts(rng, SCRIPT_COUNT)),
+        "STRATEGY": pd.Categorical.from_codes(rng.choice(len(STRATEGIES), size=rows, p=strategy_p), STRATEGIES),
+        "PLATFORM": pd.Categorical.from_codes(rng.choice(len(PLATFORMS), size=rows, p=platform_p), PLATFORMS),
+        "INVESTED": [f"₹{v:,.2f}" for v in invested],
+        "PROFIT/ABS": [f"₹{v:,.2f}" for v in profit],
+        "PROFIT/%": [f"{v:.2f}%" for v in pct],
+        "EQUITY CURVE": np.cumsum(profit).round(2),
+        "NOTES": "",
+    })
+    return b"VCapitals,,\n,,\n" + frame.to_csv(index=False).encode("utf-8")
+
+
+def synthetic_live(rows, seed=0):
+    """
+    Live-position CSV export shaped like the real sheet
+
+    A summary block above the header, the positions, then a blank line and
+    a Total row below them. The positions sit right under the header, so
+    load it with skip=0, limit=None.
+
+    Returns:
+        CSV bytes
+    """
+    rng = np.random.default_rng(seed)
+    invested = rng.uniform(10_000, 150_000, size=rows).round(2)
+    gain = rng.normal(2.0, 10.0, size=rows).round(2)
+    current = (invested * (1 + gain / 100)).round(2)
+    target = (current * rng.uniform(1.05, 1.6, size=rows)).round(2)
+    potential = ((target / current - 1) * 100).round(2)
+
+    frame = pd.DataFrame({
+        "Stock": _scripts(rng, rows),
+        "Strategy Name": rng.choice(STRATEGIES, size=rows),
+        "Market Cap": rng.choice(MARKET_CAPS, size=rows),
+        "Broker": rng.choice(PLATFORMS, size=rows),
+        "Gain": [f"{v:.2f}%" for v in gain],
+        "Current Value": [f"₹{v:,.2f}" for v in current],
+        "Invested Value": [f"₹{v:,.2f}" for v in invested],
+        "Target Price": [f"₹{v:,.2f}" for v in target],
+        "Potential Gain": [f"{v:.2f}%" for v in potential],
+        "Remaining Gain": [f"{v:.2f}%" for v in potential - gain],
+    })
+    summary = "Portfolio Summary,,\nCapital,\"₹9,00,000\",\n,,\n"
+    total = f"\nTotal,,,,,,\"₹{invested.sum():,.2f}\",,,\n"
+    return summary.encode("utf-8") + frame.to_csv(index=False).encode("utf-8") + total.encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the registered sheets by path (query strings ignored)"""
+
+    files = {}
+
+    def do_GET(self):
+        body = self.files.get(self.path.split("?")[0])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(files):
+    """
+    Local stand-in for the Google Sheets export endpoint
+
+    Args:
+        files: dict of path ("/trades.csv") to CSV bytes
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    handler = type("Handler", (_Handler,), {"files": dict(files)})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+_runs = itertools.count()
+
+
+def _cold_load(load, url):
+    """
+    Load through a URL the loader has not cached yet, so every load is a
+    cold fetch + parse; the entry is evicted afterwards so runs don't pile
+    up frames in the process-wide cache
+    """
+    fresh = f"{url}?run={next(_runs)}"
+    try:
+        return load(fresh)
+    finally:
+        trade_data.evict(fresh)
+
+
+def _stage(dataset, rows, name, fn, repeat):
+    """
+    Time fn (best of `repeat`), then run it once more under tracemalloc for peak memory
+
+    Returns:
+        (result row dict, fn's return value)
+    """
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "dataset": dataset,
+        "rows": rows,
+        "stage": name,
+        "ms": best * 1000,
+        "rows_per_s": rows / best if best else float("inf"),
+        "peak_mb": peak / 1e6,
+    }, value
+
+
+def _selections(frame, dims):
+    """Every (All | value) combination of the filter dimensions, as the sidebar offers them"""
+    options = [[kpi_cube.ALL] + list(frame[dim].cat.categories) for dim in dims]
+    return [dict(zip(dims, combo)) for combo in itertools.product(*options)]
+
+
+def bench_trades(url, rows, repeat=DEFAULT_REPEAT):
+    """
+    Dashboard path: load, filter, KPI cube, monthly/stockwise aggregation, chart data
+
+    Each stage covers every sidebar selection. The cube builds all its
+    aggregates in the "kpi" stage, so "monthly"/"stockwise"/"charts" time
+    the per-rerun lookups on top of it.
+    """
+    results = []
+
+    def stage(name, fn):
+        row, value = _stage("trades", rows, name, fn, repeat)
+        results.append(row)
+        return value
+
+    data = stage("load", lambda: _cold_load(trade_data.load_trades, url))
+    selections = _selections(data, kpi_cube.DIMENSIONS)
+
+    def filter_all():
+        index = filter_index.FilterIndex(data, kpi_cube.DIMENSIONS)
+        return [filter_index.take(data, index.select(selection)) for selection in selections]
+
+    def kpis_all():
+        cube = kpi_cube.build_cube(data)
+        return cube, [cube.kpis(s["PLATFORM"], s["STRATEGY"]) for s in selections]
+
+    filtered = stage("filter", filter_all)
+    cube, _ = stage("kpi", kpis_all)
+    stage("monthly", lambda: [cube.monthly_profit(s["PLATFORM"], s["STRATEGY"]) for s in selections])
+    stage("stockwise", lambda: [cube.stockwise(s["PLATFORM"], s["STRATEGY"]) for s in selections])
+    stage("charts", lambda: [
+        (cube.strategy_counts(s["PLATFORM"], s["STRATEGY"]), cube.platform_counts(s["PLATFORM"], s["STRATEGY"]))
+        for s in selections
+    ])
+    stage("equity", lambda: equity_analytics.compute(filtered[0], CAPITAL))
+    return results
+
+
+def bench_live(url, rows, repeat=DEFAULT_REPEAT):
+    """Live Position path: load, filter, chart counts, auto-refresh diff"""
+    results = []
+
+    def stage(name, fn):
+        row, value = _stage("live", rows, name, fn, repeat)
+        results.append(row)
+        return value
+
+    data = stage("load", lambda: _cold_load(lambda fresh: trade_data.load_live(fresh, skip=0, limit=None), url))
+    dims = ["Market Cap", "Strategy Name"]
+    selections = _selections(data, dims)
+    index = filter_index.FilterIndex(data, dims + ["Broker"])
+
+    stage("filter", lambda: [filter_index.take(data, index.select(selection)) for selection in selections])
+    stage("charts", lambda: [
+        [index.counts(col, index.select(selection)) for col in ["Strategy Name", "Market Cap", "Broker"]]
+        for selection in selections
+    ])
+
+    # A refresh where ~10% of positions moved
+    changed = data.copy()
+    moved = np.random.default_rng(1).random(len(changed)) < 0.1
+    changed.loc[moved, "Gain"] = changed.loc[moved, "Gain"] + 0.5
+    stage("diff", lambda: live_refresh.diff_frames(data, changed))
+    return results
+
+
+def run(trade_sizes=DEFAULT_TRADE_SIZES, live_sizes=DEFAULT_LIVE_SIZES, repeat=DEFAULT_REPEAT, seed=0):
+    """
+    Generate, serve and benchmark every dataset size
+
+    Returns:
+        DataFrame with one row per (dataset, rows, stage): ms, rows_per_s, peak_mb
+    """
+    files = {f"/trades-{n}.csv": synthetic_trades(n, seed) for n in trade_sizes}
+    files.update({f"/live-{n}.csv": synthetic_live(n, seed) for n in live_sizes})
+    server, base_url = serve(files)
+    try:
+        results = []
+        for n in trade_sizes:
+            results += bench_trades(f"{base_url}/trades-{n}.csv", n, repeat)
+        for n in live_sizes:
+            results += bench_live(f"{base_url}/live-{n}.csv", n, repeat)
+    finally:
+        server.shutdown()
+    return pd.DataFrame(results)
+
+
+def main(argv=None):
+    """CLI entry point: python benchmark.py --trades 10000 100000 --out bench.jsonl"""
+    parser = argparse.ArgumentParser(description="Benchmark the Dashboard and Live Position code paths on synthetic sheets.")
+    parser.add_argument("--trades", type=int, nargs="*", default=DEFAULT_TRADE_SIZES, help="Trade-history sizes (rows)")
+    parser.add_argument("--live", type=int, nargs="*", default=DEFAULT_LIVE_SIZES, help="Live-position sizes (rows)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Append results to this .jsonl file (or write a .csv)")
+    args = parser.parse_args(argv)
+    pd.set_option("mode.copy_on_write", True)  # same pandas semantics as the app
+
+    table = run(args.trades, args.live, args.repeat, args.seed)
+    if args.out:
+        if args.out.endswith(".csv"):
+            table.to_csv(args.out, index=False)
+        else:
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+            with open(args.out, "a", encoding="utf-8") as f:
+                for row in table.to_dict("records"):
+                    f.write(json.dumps({"run_at": stamp, **row}) + "\n")
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
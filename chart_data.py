@@ -0,0 +1,116 @@
+import numpy as np
+
+import trade_data
+
+# -----------------------------
+# CHART DATA
+# Chart series built from cached aggregates, memoized per loaded
+# frame and filter selection, with long time series downsampled
+# -----------------------------
+
+DEFAULT_POINTS = 600   # about one point per horizontal pixel of a half-width chart
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average, which preserves peaks and troughs.
+
+    Args:
+        x: Increasing numeric x values
+        y: y values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted positions of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample(frame, column, points=DEFAULT_POINTS):
+    """
+    One column of a time-indexed frame, LTTB-downsampled to about `points` rows
+
+    Returns:
+        Single-column DataFrame (the frame's rows when already short enough)
+    """
+    series = frame[[column]]
+    if len(series) <= points:
+        return series
+    x = frame.index.asi8 if hasattr(frame.index, "asi8") else np.arange(len(frame))
+    return series.iloc[lttb(x, series[column].to_numpy(), points)]
+
+
+def dashboard_charts(frame, cube, equity, platform, strategy, points=DEFAULT_POINTS):
+    """
+    Dashboard chart series for a selection, built once per loaded frame
+
+    Args:
+        frame: Loaded trade frame (memo key)
+        cube: kpi_cube.KpiCube for the frame
+        equity: equity_analytics.compute result for the selection
+        platform, strategy: Sidebar selection
+        points: Target points for the equity, drawdown and win rate lines
+
+    Returns:
+        dict of "strategy", "platform", "monthly", "equity", "drawdown", "rolling_win"
+    """
+    def build(_):
+        curve = equity["curve"]
+        return {
+            "strategy": cube.strategy_counts(platform, strategy),
+            "platform": cube.platform_counts(platform, strategy),
+            "monthly": cube.monthly_profit(platform, strategy),
+            "equity": downsample(curve, "Cumulative P&L", points),
+            "drawdown": downsample(curve, "Drawdown", points),
+            "rolling_win": downsample(curve, "Rolling Win %", points),
+        }
+
+    return trade_data.derived(frame, ("charts", platform, strategy, points), build)
+
+
+def live_charts(frame, index, positions, selection):
+    """
+    Live Position distribution series for a selection, built once per loaded frame
+
+    Args:
+        frame: Loaded live frame (memo key)
+        index: filter_index.FilterIndex over Strategy Name / Market Cap / Broker
+        positions: Rows in the selection
+        selection: Hashable filter key (e.g. (market_cap, strategy))
+
+    Returns:
+        dict of "strategy", "market_cap", "broker" count series
+    """
+    def build(_):
+        return {
+            "strategy": index.counts("Strategy Name", positions),
+            "market_cap": index.counts("Market Cap", positions),
+            "broker": index.counts("Broker", positions),
+        }
+
+    return trade_data.derived(frame, ("charts", selection), build)
@@ -1,34 +1,31 @@
+import time
+
 import streamlit as st
 from openai import OpenAI
 
+import analysis_store
+import chat_context
+import request_queue
+import response_cache
+import timing
+
 # -----------------------------
 # SIMPLE STOCK ANALYSIS CHAT
 # GPT-powered, no scraping, trader-focused
 # -----------------------------
 
-def initialize_chat():
-    """Initialize chat session state"""
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
+DEFAULT_TIMEOUT = 60      # seconds per API request (retries are done by request_queue)
 
-def analyze_stock(question, api_key, model="gpt-3.5-turbo"):
-    """
-    Analyze stock with AI - trader-focused insights
-    
-    Args:
-        question: User's question
-        api_key: OpenAI API key
-        model: Model to use 
-    
-    Returns:
-        AI response
-    """
-    try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
-        
-        # Expert trader prompt
-        system_prompt = """You are an expert Indian stock market trader and fundamental analyst.
+# Request parameters - optimized for cost
+COMPLETION_PARAMS = {
+    "temperature": 0.4,        # Balanced for analysis
+    "max_tokens": 700,         # Enough for detailed analysis
+    "top_p": 0.95,
+    "frequency_penalty": 0.3,
+}
+
+# Expert trader prompt
+SYSTEM_PROMPT = """You are an expert Indian stock market trader and fundamental analyst.
 
                         RESPONSE FORMAT - Use this EXACT 4-column table structure for better Streamlit display:
 
@@ -112,43 +109,161 @@ def analyze_stock(question, api_key, model="gpt-3.5-turbo"):
                         - Keep analysis brief (1 line each)
                         - Always include entry/target/stop loss prices"""
 
-        # Keep only last 3 messages for context (save tokens)
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        if "messages" in st.session_state and len(st.session_state.messages) > 0:
-            for msg in st.session_state.messages[-3:]:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"][:700]
-                })
-        
-        messages.append({"role": "user", "content": question})
-        
-        # API call - optimized for cost
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=0.4,      # Balanced for analysis
-            max_tokens=700,       # Enough for detailed analysis
-            top_p=0.95,
-            frequency_penalty=0.3
-        )
+def initialize_chat():
+    """Initialize chat session state"""
+    if "messages" not in st.session_state:
+        st.session_state.messages = []
+
+@st.cache_resource(show_spinner=False)
+def get_client(api_key, base_url=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Shared OpenAI client - one per configuration, reused across reruns and sessions
+    so its HTTP connection pool stays warm
+
+    Client-side retries are off: every request goes through request_queue,
+    which retries with backoff under its rate limits, without holding a slot.
+
+    Args:
+        api_key: OpenAI API key
+        base_url: OpenAI-compatible endpoint (None for api.openai.com)
+        timeout: Request timeout in seconds
+
+    Returns:
+        OpenAI client
+    """
+    return OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+
+def build_messages(question, history=None, usage=None):
+    """
+    Build the chat request: system prompt, token-budgeted context, question
+
+    Args:
+        question: User's question
+        history: Prior messages (defaults to the session's chat history)
+        usage: Optional dict, filled with the estimated prompt size
+
+    Returns:
+        List of message dicts
+    """
+    if history is None:
+        history = st.session_state.get("messages", [])
+
+    with timing.span("chat.build_context"):
+        messages, report = chat_context.build_context(SYSTEM_PROMPT, history, question)
+    if usage is not None:
+        usage["estimated_prompt_tokens"] = report["total"]
+        usage["history_tokens"] = report["history"]
+        usage["dropped_turns"] = report["dropped_turns"]
+    return messages
+
+def _record_usage(usage, api_usage):
+    """Copy the token counts reported by the API into a usage dict"""
+    if usage is not None and api_usage is not None:
+        usage["prompt_tokens"] = api_usage.prompt_tokens
+        usage["completion_tokens"] = api_usage.completion_tokens
+
+def analyze_stock(question, api_key, model="gpt-3.5-turbo", history=None, usage=None, user=None, **client_options):
+    """
+    Analyze stock with AI - trader-focused insights
+    
+    Args:
+        question: User's question
+        api_key: OpenAI API key
+        model: Model to use 
+        history: Prior messages (defaults to the session's chat history)
+        usage: Optional dict, filled with estimated and actual token counts,
+            and with "error" when the request failed
+        user: Per-user rate limit key for the request queue (None for none)
+        **client_options: base_url / timeout for get_client
+    
+    Returns:
+        AI response (an error message on failure)
+    """
+    try:
+        client = get_client(api_key, **client_options)
+        messages = build_messages(question, history, usage)
+        # Goes through the shared queue: concurrency cap, rate limits, backoff on 429/5xx
+        with timing.span("openai.completion", model=model):
+            response = request_queue.get_queue().submit(
+                lambda: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    **COMPLETION_PARAMS
+                ),
+                user=user, model=model,
+            )
+        _record_usage(usage, response.usage)
         
         return response.choices[0].message.content
     
     except Exception as e:
+        if usage is not None:
+            usage["error"] = str(e)
         return f"❌ Error: {str(e)}"
 
-def render_stock_chat(api_key, model="gpt-3.5-turbo"):
+def stream_stock_analysis(question, api_key, model="gpt-3.5-turbo", history=None, usage=None, user=None, **client_options):
+    """
+    Streaming variant of analyze_stock - yields text as tokens arrive
+
+    Args:
+        question: User's question
+        api_key: OpenAI API key
+        model: Model to use
+        history: Prior messages (defaults to the session's chat history)
+        usage: Optional dict, filled with estimated and actual token counts, and
+            with "error" when the request failed (possibly after some text was
+            yielded); without one the exception is raised
+        user: Per-user rate limit key for the request queue (None for none)
+        **client_options: base_url / timeout for get_client
+
+    Yields:
+        Response text chunks; the error is never part of the text
+    """
+    try:
+        client = get_client(api_key, **client_options)
+        messages = build_messages(question, history, usage)
+        with timing.span("openai.stream", model=model):
+            start = time.perf_counter()
+            # The queue slot is held until the stream ends
+            stream = request_queue.get_queue().stream(
+                lambda: client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **COMPLETION_PARAMS
+                ),
+                user=user, model=model,
+            )
+            first = True
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first:
+                        timing.record("openai.first_token", (time.perf_counter() - start) * 1000, model=model)
+                        first = False
+                    yield chunk.choices[0].delta.content
+                _record_usage(usage, chunk.usage)
+
+    except Exception as e:
+        if usage is None:
+            raise
+        usage["error"] = str(e)
+
+def render_stock_chat(api_key, model="gpt-3.5-turbo", stream=True, cache_ttl=response_cache.DEFAULT_TTL, **client_options):
     """
     Render stock analysis chat interface
     
     Args:
         api_key: OpenAI API key
         model: Model to use
+        stream: Render tokens as they arrive instead of waiting for the full answer
+        cache_ttl: Seconds a cached answer is reused (0 disables the cache)
+        **client_options: base_url / timeout for get_client
     """
     
     initialize_chat()
+    cache = response_cache.get_cache()
+    user = st.session_state.get("username")
     
     # Sidebar - Chat Stats
     with st.sidebar:
@@ -159,12 +274,18 @@ def render_stock_chat(api_key, model="gpt-3.5-turbo"):
         msg_count = len(st.session_state.messages)
         
         if msg_count > 0:
-            # Accurate token estimation
-            # Input tokens: question + context + system prompt (~60% of total)
-            # Output tokens: AI response (~40% of total)
-            total_tokens = msg_count * 200
-            input_tokens = int(total_tokens * 0.60)   # 60% input
-            output_tokens = int(total_tokens * 0.40)  # 40% output
+            recorded = [msg["usage"] for msg in st.session_state.messages if "prompt_tokens" in msg.get("usage", {})]
+            if recorded:
+                # Token counts reported by the API
+                input_tokens = sum(usage["prompt_tokens"] for usage in recorded)
+                output_tokens = sum(usage["completion_tokens"] for usage in recorded)
+            else:
+                # Accurate token estimation
+                # Input tokens: question + context + system prompt (~60% of total)
+                # Output tokens: AI response (~40% of total)
+                total_tokens = msg_count * 200
+                input_tokens = int(total_tokens * 0.60)   # 60% input
+                output_tokens = int(total_tokens * 0.40)  # 40% output
             
             # Real OpenAI pricing (per 1M tokens)
             if model == "gpt-3.5-turbo":
@@ -218,11 +339,33 @@ def render_stock_chat(api_key, model="gpt-3.5-turbo"):
                 st.caption(f"**Total:** ${total_cost_usd:.5f} (₹{total_cost_inr:.3f})")
                 st.caption(f"**Exchange:** 1 USD = ₹{exchange_rate}")
                 
+                last_usage = next((msg["usage"] for msg in reversed(st.session_state.messages) if "estimated_prompt_tokens" in msg.get("usage", {})), None)
+                if last_usage:
+                    prompt_tokens = last_usage.get("prompt_tokens", last_usage["estimated_prompt_tokens"])
+                    st.caption(
+                        f"**Last request:** {prompt_tokens:,} prompt tokens "
+                        f"(history ~{last_usage['history_tokens']:,}, {last_usage['dropped_turns']} older turns summarized)"
+                    )
+                
                 if msg_count >= 50:
                     st.warning("💡 Clear chat to reduce tokens")
         else:
             st.caption("No messages yet")
         
+        # Response cache (shared by all sessions)
+        cache_stats = cache.stats()
+        st.caption(
+            f"⚡ **Cache:** {cache_stats['hits']} hits | {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0f}%) | {cache_stats['entries']} saved"
+        )
+        
+        # Request queue (shared by all sessions)
+        queue_stats = request_queue.get_queue().stats()
+        st.caption(
+            f"🚦 **Queue:** {queue_stats['depth']} waiting | {queue_stats['active']}/{queue_stats['concurrency']} running | "
+            f"wait p50 {queue_stats['wait_p50']:.1f}s p95 {queue_stats['wait_p95']:.1f}s | {queue_stats['retries']} retries"
+        )
+        
         st.divider()
         
         # Clear button
@@ -266,12 +409,38 @@ def render_stock_chat(api_key, model="gpt-3.5-turbo"):
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # AI response
+        # AI response - repeated questions are served from the cache
+        # (follow-ups are keyed on the prior turns they are asked with)
+        with timing.span("chat.cache_lookup"):
+            cache_key = None
+            if cache_ttl > 0:
+                context = chat_context.prior_context(SYSTEM_PROMPT, st.session_state.messages, prompt)
+                cache_key = response_cache.make_key(prompt, model, SYSTEM_PROMPT, context)
+            cached = cache.get(cache_key, ttl=cache_ttl) if cache_key else None
+        usage = {}
         with st.chat_message("assistant"):
-            with st.spinner("Analyzing..."):
-                response = analyze_stock(prompt, api_key, model)
+            if cached is not None:
+                response = cached
                 st.markdown(response)
+            elif stream:
+                response = st.write_stream(stream_stock_analysis(prompt, api_key, model, usage=usage, user=user, **client_options))
+                response = response if isinstance(response, str) else "".join(map(str, response))
+                if "error" in usage:
+                    error = f"❌ Error: {usage['error']}"
+                    st.error(error)
+                    response = f"{response}\n\n{error}" if response else error
+            else:
+                with st.spinner("Analyzing..."):
+                    response = analyze_stock(prompt, api_key, model, usage=usage, user=user, **client_options)
+                    st.markdown(response)
+        
+        # Failed or partial answers are shown to this user only - never cached or stored
+        if cached is None and "error" not in usage:
+            if cache_key:
+                cache.put(cache_key, response, ttl=cache_ttl)
+            # Follow-ups ("Why?") are filed under the stock the chat is about
+            analysis_store.get_store().save(response, prompt, model, ticker=chat_context.subject(st.session_state.messages))
         
         # Save response
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        st.session_state.messages.append({"role": "assistant", "content": response, "usage": usage})
         st.rerun()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import math
+import re
+
+import response_cache
+
+# -----------------------------
+# CHAT CONTEXT BUILDER
+# Packs prior turns into a token budget instead of a fixed message count
+# -----------------------------
+
+HISTORY_TOKEN_BUDGET = 600   # tokens of prior turns sent with each question
+MAX_TURN_TOKENS = 250        # cap for any single prior turn
+
+# Fields of a previous answer worth carrying forward
+KEY_FIELDS = [
+    "P/E Ratio", "ROE", "Debt/Equity", "Valuation",
+    "Call", "Entry Zone", "Target (12M)", "Stop Loss", "Risk-Reward",
+]
+
+_TABLE_SEPARATOR = re.compile(r"^\|?[\s:|-]+\|?$")
+_SECTION_HEADING = re.compile(r"^\*\*[^*]+\*\*$")
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English/markdown)"""
+    return math.ceil(len(text) / 4)
+
+
+def _plain(cell):
+    return cell.replace("**", "").strip()
+
+
+def _table_fields(line):
+    """(name, value) pairs from one markdown table row"""
+    cells = [cell for cell in line.strip().strip("|").split("|")]
+    fields = []
+    for cell in cells:
+        if "=" in cell:
+            name, _, value = cell.partition("=")
+            fields.append((_plain(name), _plain(value)))
+    if not fields and len(cells) == 2:
+        fields.append((_plain(cells[0]), _plain(cells[1])))
+    return fields
+
+
+def answer_fields(text):
+    """
+    All "name = value" / two-column fields of an answer's markdown tables
+
+    Returns:
+        dict of field name to value (markdown bold removed)
+    """
+    return dict(
+        field for line in text.splitlines() if line.strip().startswith("|")
+        for field in _table_fields(line)
+    )
+
+
+def compact_answer(text):
+    """
+    Shrink a previous assistant answer to its headline and key fields
+
+    Markdown tables are reduced to KEY_FIELDS on one line and section
+    headings dropped; other lines (headline, risks, notes) are kept.
+    """
+    lines, fields = [], []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("|"):
+            if not _TABLE_SEPARATOR.match(stripped):
+                fields.extend((name, value) for name, value in _table_fields(stripped) if name in KEY_FIELDS)
+        elif not (lines and _SECTION_HEADING.match(stripped)):
+            lines.append(stripped)
+
+    if fields:
+        lines.insert(1 if lines else 0, "Key figures: " + "; ".join(f"{name}={value}" for name, value in fields))
+    return "\n".join(lines)
+
+
+def truncate_to_budget(text, tokens):
+    """Cut text at a line boundary so it fits in the token budget"""
+    if estimate_tokens(text) <= tokens:
+        return text
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line + "\n")
+        if used + cost > tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) if kept else text[:tokens * 4]
+
+
+def _summary(turns):
+    """One-line recap of turns that no longer fit: stocks asked about and the calls given"""
+    topics = []
+    for msg in turns:
+        if msg["role"] == "user":
+            normalized = response_cache.normalize_question(msg["content"])
+            if normalized:
+                topics.append(" vs ".join(normalized[0]))
+        else:
+            call = answer_fields(msg["content"]).get("Call")
+            if call and topics:
+                topics[-1] += f" ({call})"
+    return "Earlier in this chat: " + ", ".join(topics) if topics else None
+
+
+def build_context(system_prompt, history, question, budget=HISTORY_TOKEN_BUDGET):
+    """
+    Build the request messages within a token budget for prior turns
+
+    Newest turns are kept first; assistant answers are compacted, long
+    turns truncated, and turns that don't fit are replaced by a one-line
+    summary.
+
+    Args:
+        system_prompt: System prompt text
+        history: Prior messages ({"role", "content"} dicts), oldest first
+        question: The new user question
+        budget: Token budget for prior turns
+
+    Returns:
+        (messages, report) where report holds estimated token counts:
+        system, history, question, total, and the number of dropped turns
+    """
+    history = list(history)
+    # The UI appends the question to the history before asking
+    if history and history[-1]["role"] == "user" and history[-1]["content"] == question:
+        history.pop()
+
+    packed, used = [], 0
+    dropped = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        msg = history[i]
+        content = compact_answer(msg["content"]) if msg["role"] == "assistant" else msg["content"]
+        content = truncate_to_budget(content, MAX_TURN_TOKENS)
+        cost = estimate_tokens(content)
+        if used + cost > budget:
+            break
+        packed.append({"role": msg["role"], "content": content})
+        used += cost
+        dropped = i
+    packed.reverse()
+
+    summary = _summary(history[:dropped]) if dropped else None
+    if summary:
+        packed.insert(0, {"role": "system", "content": summary})
+        used += estimate_tokens(summary)
+
+    messages = [{"role": "system", "content": system_prompt}] + packed + [{"role": "user", "content": question}]
+    report = {
+        "system": estimate_tokens(system_prompt),
+        "history": used,
+        "question": estimate_tokens(question),
+        "dropped_turns": dropped,
+    }
+    report["total"] = report["system"] + report["history"] + report["question"]
+    return messages, report
+
+
+def subject(history):
+    """
+    Ticker(s) a chat is currently about: the newest user turn that names one
+
+    Returns:
+        "TCS" / "INFY vs TCS", or None when no turn names a stock
+    """
+    for msg in reversed(history):
+        if msg["role"] == "user":
+            normalized = response_cache.normalize_question(msg["content"])
+            if normalized:
+                return " vs ".join(normalized[0])
+    return None
+
+
+def prior_context(system_prompt, history, question, budget=HISTORY_TOKEN_BUDGET):
+    """
+    The packed prior turns build_context would send with a question
+
+    Returns:
+        List of message dicts, or None when the question has no prior turns
+    """
+    messages, _ = build_context(system_prompt, history, question, budget)
+    return messages[1:-1] or None
@@ -0,0 +1,141 @@
+import streamlit as st
+
+import chart_data
+import data_plane
+import equity_analytics
+import paged_table
+import reports
+import schema
+import snapshot_store
+import timing
+import trade_data
+
+# -----------------------------
+# DASHBOARD PAGE
+# Closed-trade KPIs, charts and equity analytics
+# -----------------------------
+
+
+def render():
+    """Render the Dashboard page"""
+    st.title("Dashboard")
+
+
+    # Load data from Google Sheets (cached across reruns and sessions)
+    csv_url = st.secrets["data"]["csv_url"]
+    refresh_now = st.sidebar.button("🔄 Refresh Data", use_container_width=True)
+    ttl = st.secrets["data"].get("cache_ttl", trade_data.DEFAULT_TTL)
+    # Serves the local Parquet snapshot on a cold start while the sheet is fetched in the background;
+    # every session gets the same shared frame by reference
+    with timing.span("dashboard.load"):
+        data = data_plane.acquire("trades", lambda: snapshot_store.serve("trades", lambda: trade_data.load_trades(csv_url, ttl=ttl, force=refresh_now), dtypes=schema.dtypes(schema.TRADE_SCHEMA)))
+    if not snapshot_store.status("trades")["reconciled"]:
+        st.caption("⏳ Showing last saved snapshot - refreshing from Google Sheets in the background.")
+
+
+
+    st.write(f"Data Loaded: {data.shape[0]} rows and {data.shape[1]} columns.")
+
+    if data.empty:
+        st.write("No data available.")
+    else:
+        # Sidebar for strategy selection
+        platform_options = ["All"] + list(data['PLATFORM'].unique())
+        selected_platform = st.sidebar.selectbox("Select a Platform", platform_options)
+        strategy_options = ["All"] + list(data['STRATEGY'].unique())
+        selected_strategy = st.sidebar.selectbox("Select a Strategy", strategy_options)
+
+        # Define your KPI values, equity curve & drawdown (computed once per data load and filter selection)
+        dashboard = reports.dashboard(data, selected_platform, selected_strategy)
+        positions, cube, kpis, equity = dashboard["positions"], dashboard["cube"], dashboard["kpis"], dashboard["equity"]
+        with timing.span("dashboard.chart_data"):
+            charts = chart_data.dashboard_charts(data, cube, equity, selected_platform, selected_strategy)
+
+        total_turnover = kpis["total_turnover"]
+        total_gained_profit = kpis["total_profit"]
+        avg_percentage = kpis["avg_percentage"]
+
+        max_return_trade = kpis["max_trade"]
+        min_return_trade = kpis["min_trade"]
+
+        # Display the metric
+        col1, col2, col3, col4, col5, col6, col7, col8 = st.columns(8)
+        col1.metric("Total Target", f"₹{kpis['target']/100000:,.1f}L", help=f"Value: {kpis['target']:,.2f}")
+        col2.metric("Remaining Target", f"₹{kpis['remaining_target']/100000:,.1f}L", help=f"Value: {kpis['remaining_target']:,.2f}")
+        col3.metric("Total Realised Gains", f"₹{total_gained_profit/100000:,.1f}L", help=f"Value: {total_gained_profit:,.2f}")
+        col4.metric("Total Turnover", f"₹{total_turnover/100000:,.1f}L", help=f"Value: {total_turnover:,.2f}")
+        col5.metric("Avg Percentage Gains", f"{avg_percentage:.2f}%")
+        col6.metric("Max Return Trade", f"₹{max_return_trade/1000:,.2f}k", help=f"Value: ₹{max_return_trade:,.2f}")
+        col7.metric("Min Return Trade", f"₹{min_return_trade/1000:,.2f}k", help=f"Value: ₹{min_return_trade:,.2f}")
+        col8.metric("Total Trades", f"{kpis['trades']}")
+
+        # Only the visible page is sent to the browser; search/sort run on the cached frame
+        with timing.span("dashboard.table"):
+            paged_table.render_paged_table(data, "filtered_data_table", positions=positions, search_columns=["SCRIPT", "STRATEGY", "PLATFORM"], hide_index=True, column_config={"ENTRY DATE": st.column_config.DateColumn(), "EXIT DATE": st.column_config.DateColumn()})
+        st.write(f"Filtered Data: {len(positions)} rows and {data.shape[1]} columns.")
+
+        # Additional Charts
+        st.subheader("Additional Charts")       
+        col1, col2, col3 = st.columns(3)
+        with timing.span("dashboard.charts"):
+            with col1:
+                st.write("Strategy Distribution")
+                st.bar_chart(charts["strategy"])
+            with col2:
+                st.write("Platform Distribution")
+                st.bar_chart(charts["platform"])   
+            with col3:
+                st.write("Monthly Realised Gains")
+                st.bar_chart(charts["monthly"])   
+
+        with st.expander("Stockwise Realised Gains"), timing.span("dashboard.stockwise"):  
+            monthly_profit_stockwise = cube.stockwise(selected_platform, selected_strategy)
+
+            paged_table.render_paged_table(
+                    monthly_profit_stockwise, "stockwise_table",
+                    search_columns=["SCRIPT"],
+                    column_config={
+                        "TOTAL_PROFIT_ABS": st.column_config.NumberColumn(
+                            "Total Realised Gains",
+                            format="₹%.2f"
+                        ),
+                        "AVG_PROFIT_PCT": st.column_config.NumberColumn(
+                            "Avg Profit %",
+                            format="%.2f%%"
+                        )
+                    }
+            )
+
+        st.subheader("Equity Curve, Drawdown & Win Rate")
+        equity_metrics = equity["metrics"]
+        col1, col2, col3, col4, col5, col6 = st.columns(6)
+        col1.metric("Max Drawdown", f"₹{equity_metrics['max_drawdown']/100000:,.1f}L", help=f"{equity_metrics['max_drawdown_pct']:.2f}% of capital + peak")
+        col2.metric("Win Rate", f"{equity_metrics['win_rate']:.1f}%")
+        col3.metric("Sharpe", f"{equity_metrics['sharpe']:.2f}", help="Annualized, daily realised P&L on capital")
+        col4.metric("Sortino", f"{equity_metrics['sortino']:.2f}", help="Annualized, daily realised P&L on capital")
+        col5.metric("Avg Holding", f"{equity_metrics['avg_holding_days']:.1f} days")
+        col6.metric("Closed Trades", f"{equity_metrics['trades']}")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.write("Cumulative Realised P&L")
+            st.line_chart(charts["equity"])
+        with col2:
+            st.write("Drawdown")
+            st.area_chart(charts["drawdown"])
+        with col3:
+            st.write(f"Rolling Win % (last {equity_analytics.ROLLING_WINDOW} trades)")
+            st.line_chart(charts["rolling_win"])
+
+        with st.expander("Strategy Expectancy"):
+            st.dataframe(
+                    equity["strategies"],
+                    hide_index=True,
+                    column_config={
+                        "Win %": st.column_config.NumberColumn(format="%.1f%%"),
+                        "Avg Win": st.column_config.NumberColumn(format="₹%.2f"),
+                        "Avg Loss": st.column_config.NumberColumn(format="₹%.2f"),
+                        "Expectancy": st.column_config.NumberColumn(format="₹%.2f"),
+                    },
+                    use_container_width=True
+            )
@@ -0,0 +1,141 @@
+import sys
+import threading
+import time
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# -----------------------------
+# SHARED DATA PLANE
+# One immutable typed frame per dataset version, handed to every
+# session by reference; sessions keep only their filter state
+# (main.py turns on pandas copy-on-write so nothing derived from a
+# shared frame can write back into it)
+# -----------------------------
+
+SESSION_EXPIRY = 3600  # seconds without a rerun before a session is dropped from the report
+
+_datasets = {}
+_sessions = {}
+_lock = threading.Lock()
+
+
+class Dataset:
+    """One published version of a dataset"""
+
+    def __init__(self, name, version, frame, nbytes):
+        self.name = name
+        self.version = version
+        self.frame = frame
+        self.bytes = nbytes
+        self.published_at = time.time()
+
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def publish(name, frame):
+    """
+    Make a frame the current version of a dataset (no-op if it already is)
+
+    Returns:
+        Dataset
+    """
+    with _lock:
+        current = _datasets.get(name)
+        if current is not None and current.frame is frame:
+            return current
+
+    # Sized outside the lock; the version is read and bumped under one acquisition
+    nbytes = int(frame.memory_usage(deep=True).sum())
+    with _lock:
+        current = _datasets.get(name)
+        if current is not None and current.frame is frame:
+            return current
+        dataset = _datasets[name] = Dataset(name, current.version + 1 if current else 1, frame, nbytes)
+    return dataset
+
+
+def acquire(name, load):
+    """
+    Current frame of a dataset for this session, by reference
+
+    Args:
+        name: Dataset name ("trades", "live")
+        load: Callable returning the latest frame (expected to be cached)
+
+    Returns:
+        The shared DataFrame - read-only, derive rather than modify
+    """
+    dataset = publish(name, load())
+    session_id = _session_id()
+    if session_id is not None:
+        with _lock:
+            session = _sessions.setdefault(session_id, {"datasets": {}})
+            session["datasets"][name] = dataset.version
+            session["seen"] = time.time()
+    return dataset.frame
+
+
+def _deep_size(obj, seen=None):
+    """Approximate bytes held by a session_state value"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+def track_session(session_state, username):
+    """Record the bytes this session keeps in its own state (call once per rerun)"""
+    session_id = _session_id()
+    if session_id is None:
+        return
+    state_bytes = sum(_deep_size(session_state[key]) for key in list(session_state.keys()))
+    with _lock:
+        session = _sessions.setdefault(session_id, {"datasets": {}})
+        session.update(user=username, state_bytes=state_bytes, seen=time.time())
+
+
+def report():
+    """
+    Memory held by the shared datasets and by each session
+
+    Returns:
+        (datasets DataFrame, sessions DataFrame)
+    """
+    now = time.time()
+    with _lock:
+        for session_id in [s for s, info in _sessions.items() if now - info.get("seen", now) > SESSION_EXPIRY]:
+            del _sessions[session_id]
+        datasets = pd.DataFrame([
+            {
+                "Dataset": d.name,
+                "Version": d.version,
+                "Rows": len(d.frame),
+                "MB": d.bytes / 1e6,
+                "Sessions": sum(1 for s in _sessions.values() if s["datasets"].get(d.name) == d.version),
+            }
+            for d in _datasets.values()
+        ])
+        sessions = pd.DataFrame([
+            {
+                "Session": session_id[:8],
+                "User": info.get("user", ""),
+                "Datasets": ", ".join(f"{name} v{version}" for name, version in info["datasets"].items()),
+                "State KB": info.get("state_bytes", 0) / 1e3,
+                "Idle s": round(now - info.get("seen", now)),
+            }
+            for session_id, info in _sessions.items()
+        ])
+    return datasets, sessions
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# EQUITY CURVE & DRAWDOWN ANALYTICS
+# Vectorized metrics over trades sorted by exit date
+# -----------------------------
+
+ROLLING_WINDOW = 20       # trades in the rolling win rate
+TRADING_DAYS = 252
+
+
+def _empty(capital):
+    return {
+        "curve": pd.DataFrame({"Cumulative P&L": [], "Drawdown": [], "Rolling Win %": []},
+                              index=pd.DatetimeIndex([], name="EXIT DATE")),
+        "metrics": {
+            "trades": 0, "net_profit": 0.0, "max_drawdown": 0.0, "max_drawdown_pct": 0.0,
+            "win_rate": np.nan, "sharpe": np.nan, "sortino": np.nan, "avg_holding_days": np.nan,
+            "capital": capital,
+        },
+        "strategies": pd.DataFrame(columns=["STRATEGY", "Trades", "Win %", "Avg Win", "Avg Loss", "Expectancy"]),
+    }
+
+
+def _strategy_expectancy(strategies, pnl, wins):
+    """Per-strategy win rate, average win/loss and expectancy from category codes"""
+    codes = strategies.cat.codes.to_numpy()
+    valid = codes >= 0
+    codes, pnl, wins = codes[valid], pnl[valid], wins[valid]
+    size = len(strategies.cat.categories)
+
+    trades = np.bincount(codes, minlength=size)
+    win_count = np.bincount(codes, weights=wins, minlength=size)
+    win_sum = np.bincount(codes, weights=np.where(wins, pnl, 0.0), minlength=size)
+    loss_sum = np.bincount(codes, weights=np.where(wins, 0.0, pnl), minlength=size)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = win_count / trades
+        avg_win = win_sum / win_count
+        avg_loss = loss_sum / (trades - win_count)
+    expectancy = np.nan_to_num(win_rate * avg_win) + np.nan_to_num((1 - win_rate) * avg_loss)
+
+    table = pd.DataFrame({
+        "STRATEGY": strategies.cat.categories.astype(object),
+        "Trades": trades,
+        "Win %": win_rate * 100,
+        "Avg Win": avg_win,
+        "Avg Loss": avg_loss,
+        "Expectancy": expectancy,
+    })
+    return table[table["Trades"] > 0].sort_values("Expectancy", ascending=False, ignore_index=True)
+
+
+def compute(frame, capital, window=ROLLING_WINDOW):
+    """
+    Equity curve, drawdown and trade statistics for a typed trade frame
+
+    Args:
+        frame: DataFrame normalized with schema.TRADE_SCHEMA (any filter applied)
+        capital: Starting capital, for percentage drawdown and returns
+        window: Trades in the rolling win rate
+
+    Returns:
+        dict with
+          "curve": daily Cumulative P&L, Drawdown and Rolling Win % indexed by EXIT DATE
+          "metrics": trades, net_profit, max_drawdown(_pct), win_rate, sharpe,
+                     sortino (annualized, daily P&L on capital), avg_holding_days
+          "strategies": per-strategy trades, win %, avg win/loss and expectancy
+    """
+    exit_dates = frame["EXIT DATE"].to_numpy()
+    closed = ~np.isnat(exit_dates)
+    if not closed.any():
+        return _empty(capital)
+
+    order = np.flatnonzero(closed)[np.argsort(exit_dates[closed], kind="stable")]
+    dates = exit_dates[order]
+    pnl = np.nan_to_num(frame["PROFIT/ABS"].to_numpy()[order])
+    wins = pnl > 0
+
+    # Cumulative P&L and running drawdown from the peak (starting at 0)
+    cum = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(cum, 0.0))
+    drawdown = cum - peak
+    trough = np.argmin(drawdown)
+    max_drawdown = drawdown[trough]
+    max_drawdown_pct = max_drawdown / (capital + peak[trough]) * 100 if capital else np.nan
+
+    # Rolling win rate over the last `window` trades
+    win_cum = np.concatenate(([0], np.cumsum(wins)))
+    n = np.arange(1, len(pnl) + 1)
+    start = np.maximum(n - window, 0)
+    rolling_win = (win_cum[n] - win_cum[start]) / (n - start) * 100
+
+    # One point per exit day: the state after its last trade
+    last_of_day = np.flatnonzero(np.r_[dates[1:] != dates[:-1], True])
+    curve = pd.DataFrame(
+        {"Cumulative P&L": cum[last_of_day], "Drawdown": drawdown[last_of_day], "Rolling Win %": rolling_win[last_of_day]},
+        index=pd.DatetimeIndex(dates[last_of_day], name="EXIT DATE"),
+    )
+
+    # Sharpe/Sortino on daily P&L relative to capital (exit days only)
+    first_of_day = np.r_[0, last_of_day[:-1] + 1]
+    daily = np.add.reduceat(pnl, first_of_day) / capital if capital else np.full(len(first_of_day), np.nan)
+    std = daily.std(ddof=1) if len(daily) > 1 else np.nan
+    downside = np.sqrt(np.mean(np.minimum(daily, 0.0) ** 2))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = daily.mean() / std * np.sqrt(TRADING_DAYS) if std else np.nan
+        sortino = daily.mean() / downside * np.sqrt(TRADING_DAYS) if downside else np.nan
+
+    holding = (frame["EXIT DATE"] - frame["ENTRY DATE"]).dt.days.to_numpy()[order]
+    holding = holding[~np.isnan(holding)]
+
+    return {
+        "curve": curve,
+        "metrics": {
+            "trades": len(pnl),
+            "net_profit": float(cum[-1]),
+            "max_drawdown": float(max_drawdown),
+            "max_drawdown_pct": float(max_drawdown_pct),
+            "win_rate": float(wins.mean() * 100),
+            "sharpe": float(sharpe),
+            "sortino": float(sortino),
+            "avg_holding_days": float(holding.mean()) if len(holding) else np.nan,
+            "capital": capital,
+        },
+        "strategies": _strategy_expectancy(frame["STRATEGY"].iloc[order], pnl, wins),
+    }
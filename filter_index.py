@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# FILTER INDEX
+# Category code -> sorted row positions, so sidebar selections are
+# intersected with NumPy instead of chained boolean-mask DataFrames
+# -----------------------------
+
+ALL = "All"
+
+
+class FilterIndex:
+    """Row positions for every value of a set of categorical columns"""
+
+    def __init__(self, frame, columns):
+        self._rows = len(frame)
+        self._codes = {}
+        self._lookup = {}
+        self._positions = {}
+
+        for col in columns:
+            values = frame[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            codes = values.cat.codes.to_numpy()
+            categories = values.cat.categories
+
+            # Stable sort groups the rows of each code while keeping them in order
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+
+            self._codes[col] = codes
+            self._lookup[col] = {value: code for code, value in enumerate(categories)}
+            self._positions[col] = [order[bounds[i]:bounds[i + 1]] for i in range(len(categories))]
+
+    def _dimension(self, col, selection):
+        """Sorted positions for one column's selection, or None when unfiltered"""
+        if selection is None or (isinstance(selection, str) and selection == ALL):
+            return None
+        values = [selection] if isinstance(selection, str) or np.isscalar(selection) else list(selection)
+        if not values or ALL in values:
+            return None
+
+        lookup = self._lookup[col]
+        arrays = [self._positions[col][lookup[value]] for value in values if value in lookup]
+        if not arrays:
+            return np.empty(0, dtype=np.intp)
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.sort(np.concatenate(arrays))
+
+    def select(self, selections):
+        """
+        Row positions matching every selection
+
+        Args:
+            selections: Mapping of column to a value, a list of values
+                (multi-select), or "All"/None for no filter
+
+        Returns:
+            Sorted numpy array of row positions
+        """
+        dimensions = [self._dimension(col, selection) for col, selection in selections.items()]
+        dimensions = sorted((d for d in dimensions if d is not None), key=len)
+        if not dimensions:
+            return np.arange(self._rows)
+
+        positions = dimensions[0]
+        for other in dimensions[1:]:
+            if not len(positions):
+                break
+            positions = np.intersect1d(positions, other, assume_unique=True)
+        return positions
+
+    def counts(self, col, positions=None):
+        """
+        Row count per value of a column within the given positions (like value_counts)
+
+        Returns:
+            Series sorted by count, zero-count values dropped
+        """
+        codes = self._codes[col] if positions is None else self._codes[col][positions]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self._lookup[col]))
+        result = pd.Series(counts, index=pd.Index(list(self._lookup[col]), name=col), name="count")
+        return result[result > 0].sort_values(ascending=False, kind="stable")
+
+
+def take(frame, positions):
+    """Rows at the given positions; the frame itself when nothing was filtered out"""
+    if len(positions) == len(frame):
+        return frame
+    return frame.iloc[positions]
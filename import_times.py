@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# -----------------------------
+# IMPORT-TIME MEASUREMENT
+# Cold-start cost of main.py's shared imports and of each page module,
+# each measured in a fresh interpreter
+# -----------------------------
+
+SHARED = ["streamlit", "data_plane", "timing"]
+PAGES = {
+    "Dashboard": "dashboard_page",
+    "Live Position": "live_page",
+    "AI Analyst": "ai_analyst_page",
+    "Strategy": "strategy_page",
+}
+
+# Runs in the child: import modules in order, report ms per module and for a warm re-import
+_PROBE = """
+import importlib, json, sys, time
+times = {}
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    importlib.import_module(name)
+    times[name] = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+warm = (time.perf_counter() - start) * 1000
+print(json.dumps({"times": times, "warm": warm, "openai": "openai" in sys.modules}))
+"""
+
+
+def measure(modules, repeat=3):
+    """
+    Import modules in order in fresh interpreters (best of `repeat`)
+
+    Returns:
+        dict with "times" (ms per module), "warm" (ms to import them again)
+        and "openai" (whether openai got loaded)
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, *modules],
+            cwd=here, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or sum(result["times"].values()) < sum(best["times"].values()):
+            best = result
+    return best
+
+
+def main(argv=None):
+    """CLI entry point: python import_times.py [--repeat 5]"""
+    parser = argparse.ArgumentParser(description="Measure app cold-start import time, eager vs per-page.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per measurement (best is reported)")
+    args = parser.parse_args(argv)
+
+    eager = measure(SHARED + list(PAGES.values()), args.repeat)
+    eager_total = sum(eager["times"].values())
+    shared = sum(eager["times"][name] for name in SHARED)
+
+    print("Session start / first rerun (fresh process)")
+    print(f"  {'all pages eagerly':<22}{eager_total:9.1f} ms")
+    for page, module in PAGES.items():
+        lazy = measure(SHARED + [module], args.repeat)
+        total = sum(lazy["times"].values())
+        openai = "openai loaded" if lazy["openai"] else "no openai"
+        print(f"  {page + ' only':<22}{total:9.1f} ms  (page {lazy['times'][module]:6.1f} ms, saves {eager_total - total:6.1f} ms, {openai})")
+    print(f"  {'shared imports':<22}{shared:9.1f} ms")
+
+    print("Later reruns (modules already loaded)")
+    print(f"  {'page import statement':<22}{eager['warm'] / len(eager['times']) * 1000:9.1f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
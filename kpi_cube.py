@@ -0,0 +1,183 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# DASHBOARD KPI CUBE
+# Sums/counts/min/max per (platform, strategy, month, script), rolled up
+# once per data load so filter changes are dictionary lookups
+# -----------------------------
+
+ALL = "All"
+DIMENSIONS = ["PLATFORM", "STRATEGY"]
+
+_MEASURES = {
+    "invested": "sum",
+    "profit": "sum",
+    "profit_max": "max",
+    "profit_min": "min",
+    "trades": "sum",
+    "pct_sum": "sum",
+    "pct_count": "sum",
+}
+
+
+def _empty_kpis():
+    return {
+        "total_turnover": 0.0,
+        "total_profit": 0.0,
+        "max_trade": np.nan,
+        "min_trade": np.nan,
+        "trades": 0,
+    }
+
+
+def _build_leaf(frame):
+    """Finest grain of the cube: one row per (platform, strategy, month, script)"""
+    keys = pd.DataFrame({
+        "PLATFORM": frame["PLATFORM"].astype(object),
+        "STRATEGY": frame["STRATEGY"].astype(object),
+        # Formatted as "YYYY-MM" only after the roll-up (strftime per row is slow)
+        "Month": frame["EXIT DATE"].dt.to_period("M"),
+        "SCRIPT": frame["SCRIPT"].astype(object),
+    })
+    values = pd.DataFrame({
+        "invested": frame["INVESTED"],
+        "profit": frame["PROFIT/ABS"],
+        "profit_max": frame["PROFIT/ABS"],
+        "profit_min": frame["PROFIT/ABS"],
+        "trades": 1,
+        "pct_sum": frame["PROFIT/%"],
+        "pct_count": frame["PROFIT/%"].notna().astype("int64"),
+    })
+    grouped = pd.concat([keys, values], axis=1).groupby(list(keys.columns), dropna=False, sort=False)
+    return grouped.agg(_MEASURES).reset_index()
+
+
+def _rollup(leaf, extra):
+    """
+    Aggregate the leaf over every subset of DIMENSIONS, filling ALL for rolled-up ones
+
+    Returns:
+        DataFrame indexed by DIMENSIONS + extra
+    """
+    levels = []
+    for keep in itertools.product([True, False], repeat=len(DIMENSIONS)):
+        by = [dim for dim, kept in zip(DIMENSIONS, keep) if kept] + extra
+        if by:
+            level = leaf.groupby(by, dropna=False, sort=False).agg(_MEASURES).reset_index()
+        else:
+            level = leaf.agg(_MEASURES).to_frame().T
+        for dim, kept in zip(DIMENSIONS, keep):
+            if not kept:
+                level[dim] = ALL
+        levels.append(level)
+    table = pd.concat(levels, ignore_index=True)
+    table = table.astype({measure: "float64" for measure in _MEASURES})
+    return table.set_index(DIMENSIONS + extra)
+
+
+def _split(table):
+    """Map each (platform, strategy) selection to its slice of a rolled-up table"""
+    return {
+        key: group.droplevel(DIMENSIONS)
+        for key, group in table.groupby(level=DIMENSIONS, dropna=False, sort=False)
+    }
+
+
+def _month_labels(frame):
+    """Period index -> "YYYY-MM" strings named Month"""
+    frame.index = pd.Index(frame.index.strftime("%Y-%m"), name="Month", dtype=object)
+    return frame
+
+
+class KpiCube:
+    """Pre-aggregated Dashboard numbers for every PLATFORM x STRATEGY selection"""
+
+    def __init__(self, frame):
+        leaf = _build_leaf(frame)
+
+        totals = _rollup(leaf, [])
+        self._kpis = {
+            key: {
+                "total_turnover": float(row["invested"]),
+                "total_profit": float(row["profit"]),
+                "max_trade": float(row["profit_max"]),
+                "min_trade": float(row["profit_min"]),
+                "trades": int(row["trades"]),
+            }
+            for key, row in totals.iterrows()
+        }
+        self._trades = totals["trades"].astype("int64")
+
+        monthly = _rollup(leaf[leaf["Month"].notna()], ["Month"])
+        self._monthly = {
+            key: _month_labels(group["profit"].sort_index().rename("PROFIT/ABS").to_frame())
+            for key, group in _split(monthly).items()
+        }
+
+        stockwise = _rollup(leaf[leaf["SCRIPT"].notna()], ["SCRIPT"])
+        self._stockwise = {
+            key: pd.DataFrame({
+                "SCRIPT": group.index,
+                "TOTAL_PROFIT_ABS": group["profit"].to_numpy(dtype="float64"),
+                "AVG_PROFIT_PCT": (group["pct_sum"] / group["pct_count"].where(group["pct_count"] > 0)).to_numpy(dtype="float64"),
+            }).sort_values("SCRIPT", ignore_index=True)
+            for key, group in _split(stockwise).items()
+        }
+
+    def kpis(self, platform=ALL, strategy=ALL):
+        """
+        Headline metrics for a selection
+
+        Returns:
+            dict with total_turnover, total_profit, max_trade, min_trade, trades
+        """
+        return self._kpis.get((platform, strategy)) or _empty_kpis()
+
+    def _counts(self, dim, other_dim, platform, strategy):
+        selected = {"PLATFORM": platform, "STRATEGY": strategy}
+        try:
+            trades = self._trades.xs(selected[other_dim], level=other_dim)
+        except KeyError:
+            return pd.Series([], name="count", index=pd.Index([], name=dim, dtype=object), dtype="int64")
+        trades = trades[(trades.index != ALL) & trades.index.notna() & (trades > 0)]
+        if selected[dim] != ALL:
+            trades = trades[trades.index == selected[dim]]
+        return trades.rename("count").rename_axis(dim).sort_values(ascending=False, kind="stable")
+
+    def strategy_counts(self, platform=ALL, strategy=ALL):
+        """Trade count per STRATEGY within the selection (like value_counts)"""
+        return self._counts("STRATEGY", "PLATFORM", platform, strategy)
+
+    def platform_counts(self, platform=ALL, strategy=ALL):
+        """Trade count per PLATFORM within the selection (like value_counts)"""
+        return self._counts("PLATFORM", "STRATEGY", platform, strategy)
+
+    def monthly_profit(self, platform=ALL, strategy=ALL):
+        """Realised PROFIT/ABS per exit month ("YYYY-MM"), indexed by Month"""
+        monthly = self._monthly.get((platform, strategy))
+        if monthly is None:
+            return pd.DataFrame({"PROFIT/ABS": []}, index=pd.Index([], name="Month", dtype=object))
+        return monthly
+
+    def stockwise(self, platform=ALL, strategy=ALL):
+        """Per-SCRIPT total PROFIT/ABS and mean PROFIT/% sorted by SCRIPT"""
+        stockwise = self._stockwise.get((platform, strategy))
+        if stockwise is None:
+            return pd.DataFrame({"SCRIPT": [], "TOTAL_PROFIT_ABS": [], "AVG_PROFIT_PCT": []})
+        return stockwise
+
+
+def build_cube(frame):
+    """
+    Build the KPI cube for a typed trade-history frame
+
+    Args:
+        frame: DataFrame normalized with schema.TRADE_SCHEMA
+
+    Returns:
+        KpiCube
+    """
+    return KpiCube(frame)
@@ -0,0 +1,178 @@
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import chart_data
+import data_plane
+import filter_index
+import live_refresh
+import reports
+import scenarios
+import schema
+import snapshot_store
+import timing
+import trade_data
+import track_record
+
+# -----------------------------
+# LIVE POSITION PAGE
+# Open positions with optional background auto-refresh
+# -----------------------------
+
+
+def _render_what_if(live, realised):
+    """What-if expander: whole-portfolio P&L and target progress across price moves"""
+    with st.expander("🧪 What-if Scenarios"):
+        col1, col2 = st.columns(2)
+        kind = col1.selectbox("Scenario", list(scenarios.KINDS), format_func=scenarios.KINDS.get, key="scenario_kind")
+        if kind == "target":
+            moves = scenarios.TARGET_FRACTIONS
+        else:
+            low, high = col2.slider("Price move (%)", -50, 50, (-20, 20), step=5, key="scenario_range")
+            moves = tuple(range(low, high + 1, max(1, (high - low) // 20)))
+
+        target = reports.CAPITAL * reports.TARGET_PCT / 100
+        st.caption(f"Realised ₹{realised/100000:,.1f}L counted toward the ₹{target/100000:,.1f}L target ({reports.TARGET_PCT}% of capital)")
+        try:
+            result = scenarios.evaluate(live, kind, moves, realised=realised)
+        except ValueError as e:
+            st.warning(f"⚠️ {e} - narrow the price move range")
+            return
+
+        money = st.column_config.NumberColumn(format="₹%.0f")
+        if kind in ("uniform", "target"):
+            table = result["table"]
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("Unrealised P&L")
+                st.line_chart(table["Unrealised P&L"])
+            with col2:
+                st.write("Target Progress %")
+                st.line_chart(table["Target Progress %"])
+            st.dataframe(table, use_container_width=True, column_config={
+                "Portfolio Value": money, "Unrealised P&L": money,
+                "Target Progress %": st.column_config.NumberColumn(format="%.1f%%"),
+            })
+        elif kind == "stock":
+            st.write("Position P&L at each move (other positions flat)")
+            table = result["table"].rename(columns=lambda col: col if col == "Stock" else f"{col:+g}%")
+            st.dataframe(table, hide_index=True, use_container_width=True,
+                         column_config={col: money for col in table.columns[1:]})
+        else:
+            st.write("Portfolio P&L with one market cap moving at a time")
+            st.line_chart(result["by_bucket"])
+            buckets = result["buckets"]
+            if len(buckets) >= 2:
+                # Slice of the surface: first two buckets, the rest at the smallest |move|
+                flat = int(np.argmin(np.abs(result["by_bucket"].index.to_numpy())))
+                surface = result["surface"][(slice(None), slice(None)) + (flat,) * (len(buckets) - 2)]
+                st.write(f"Portfolio P&L: {buckets[0]} (rows) x {buckets[1]} (columns)")
+                st.dataframe(pd.DataFrame(surface, index=result["by_bucket"].index, columns=result["by_bucket"].index).round(0), use_container_width=True)
+
+
+def render():
+    """Render the Live Position page"""
+    st.title("Live Position")
+
+
+    try:
+        # Read live position data from Google Sheets
+        live_url = st.secrets["data"]["csv_live_url"]
+        with timing.span("live.load"):
+            live_data = data_plane.acquire("live", lambda: trade_data.load_live(live_url, ttl=st.secrets["data"].get("cache_ttl", trade_data.DEFAULT_TTL)))
+
+        # Sidebar for strategy selection
+        platform_options = ["All"] + list(live_data['Market Cap'].unique())
+        selected_platform = st.sidebar.selectbox("Select a Market Cap", platform_options)
+        strategy_options = ["All"] + list(live_data['Strategy Name'].unique())
+        selected_strategy = st.sidebar.selectbox("Select a Strategy", strategy_options)
+
+        # Auto refresh polls the sheet in the background and reruns only the positions fragment
+        auto_refresh = st.sidebar.toggle("⏱️ Auto Refresh", value=False, help="Poll the live sheet during market hours")
+        refresh_interval = st.secrets["data"].get("live_refresh_interval", live_refresh.DEFAULT_INTERVAL)
+
+        # Closed-trade track record for each position (stats built once per history load)
+        try:
+            with timing.span("live.track_record"):
+                history = data_plane.acquire("trades", lambda: snapshot_store.serve("trades", lambda: trade_data.load_trades(st.secrets["data"]["csv_url"], ttl=st.secrets["data"].get("cache_ttl", trade_data.DEFAULT_TTL)), dtypes=schema.dtypes(schema.TRADE_SCHEMA)))
+                record = trade_data.derived(history, "track_record", track_record.build_track_record)
+                realised = trade_data.derived(history, "total_profit", lambda frame: float(frame["PROFIT/ABS"].sum()))
+        except Exception:
+            record, realised = None, 0.0
+
+        def render_live_positions():
+            data, diff, polled_at = live_data, None, None
+            if auto_refresh:
+                _, polled, diff, polled_at = live_refresh.get_poller(live_url, refresh_interval).latest()
+                data = data_plane.acquire("live", lambda: live_data if polled is None else polled)
+
+            live_view = reports.live(data, selected_platform, selected_strategy)
+            index, positions, filtered_data = live_view["index"], live_view["positions"], live_view["filtered"]
+            if record is not None:
+                filtered_data = filter_index.take(record.join(data), positions)
+
+            st.write(f"Data Loaded: {filtered_data.shape[0]} rows and {filtered_data.shape[1]} columns.")
+            if polled_at is not None:
+                st.caption(f"🔄 Last checked {time.strftime('%H:%M:%S', time.localtime(polled_at))} - refreshing every {refresh_interval}s")
+            # Define your KPI values
+            top_gainer = live_view["kpis"]["top_gainer"]
+            top_looser = live_view["kpis"]["top_looser"]
+
+
+            # Display the metric
+            col1, col2, col3,col4 = st.columns(4)       
+            col3.metric("Top Gainer", f"₹{top_gainer:,.2f}%" if top_gainer is not None else "N/A", help=f"Value: ₹{top_gainer:,.2f}" if top_gainer is not None else "N/A")
+            col4.metric("Top Looser", f"₹{top_looser:,.2f}%" if top_looser is not None else "N/A", help=f"Value: ₹{top_looser:,.2f}" if top_looser is not None else "N/A")
+
+            with timing.span("live.table"):
+                st.dataframe(
+                    filtered_data, hide_index=True, use_container_width=True,
+                    column_config={
+                        "Hist Trades": st.column_config.NumberColumn(format="%d", help="Closed trades in history"),
+                        "Hist Win %": st.column_config.NumberColumn(format="%.0f%%"),
+                        "Hist Avg %": st.column_config.NumberColumn(format="%.2f%%", help="Average PROFIT/% of closed trades"),
+                        "Hist Avg Days": st.column_config.NumberColumn(format="%.1f", help="Average holding days"),
+                        "Hist Basis": st.column_config.TextColumn(help="Script + Strategy history, or the script's overall history when that strategy has none"),
+                    },
+                )       
+
+            # Changes picked up by the last poll
+            if diff is not None and (len(diff["changed"]) or len(diff["added"]) or len(diff["removed"])):
+                with st.expander(f"🔔 Changes since previous refresh: {len(diff['changed'])} cells, {len(diff['added'])} new, {len(diff['removed'])} closed"):
+                    if len(diff["changed"]):
+                        st.dataframe(diff["changed"], hide_index=True, use_container_width=True)
+                    if len(diff["added"]):
+                        st.write("New positions")
+                        st.dataframe(diff["added"], hide_index=True, use_container_width=True)
+                    if len(diff["removed"]):
+                        st.write("Closed positions")
+                        st.dataframe(diff["removed"], hide_index=True, use_container_width=True)
+
+            # Additional Charts
+            st.subheader("Additional Charts")       
+            col1, col2, col3 = st.columns(3)
+            with timing.span("live.charts"):
+                charts = chart_data.live_charts(data, index, positions, (selected_platform, selected_strategy))
+                with col1:
+                    st.write("Strategy Distribution")
+                    st.bar_chart(charts["strategy"])
+                with col2:
+                    st.write("Market Cap Distribution")
+                    st.bar_chart(charts["market_cap"])
+                with col3:
+                    st.write("Platform Distribution")
+                    st.bar_chart(charts["broker"])  
+
+            # Scenarios follow the sidebar selection and the auto-refreshed positions
+            with timing.span("live.scenarios"):
+                _render_what_if(live_view["filtered"], realised)
+
+        if auto_refresh:
+            st.fragment(run_every=refresh_interval)(render_live_positions)()
+        else:
+            render_live_positions()
+
+    except Exception as e:
+        st.error("Error loading live position data")
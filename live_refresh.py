@@ -0,0 +1,134 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import trade_data
+
+# -----------------------------
+# LIVE POSITION AUTO-REFRESH
+# Background poller for the live sheet with row-level diffs,
+# so the page only re-renders its live fragment when data changes
+# -----------------------------
+
+DEFAULT_INTERVAL = 60   # seconds between polls
+IDLE_POLLS = 5          # stop polling after this many intervals without a reader
+DIFF_KEYS = ["Stock", "Strategy Name"]
+
+_pollers = {}
+_lock = threading.Lock()
+
+
+def _keyed(frame, keys):
+    """Index a frame by its key columns (+ occurrence number for duplicate keys)"""
+    frame = frame.reset_index(drop=True)
+    occurrence = frame.groupby(keys, observed=True, dropna=False).cumcount().rename("#")
+    key_frame = frame[keys].astype(object).assign(**{"#": occurrence})
+    return frame.drop(columns=keys).set_index(pd.MultiIndex.from_frame(key_frame))
+
+
+def diff_frames(old, new, keys=DIFF_KEYS):
+    """
+    Row-level diff between two live snapshots
+
+    Args:
+        old: Previous DataFrame (or None)
+        new: Current DataFrame
+        keys: Columns identifying a position
+
+    Returns:
+        dict with "added" and "removed" (DataFrames of rows) and
+        "changed" (one row per changed cell: keys, column, old, new)
+    """
+    if old is None:
+        return {"added": new, "removed": new.iloc[:0], "changed": pd.DataFrame(columns=keys + ["column", "old", "new"])}
+
+    old_keyed, new_keyed = _keyed(old, keys), _keyed(new, keys)
+    common = old_keyed.index.intersection(new_keyed.index)
+    columns = [col for col in new_keyed.columns if col in old_keyed.columns]
+
+    before = old_keyed.loc[common, columns].astype(object)
+    after = new_keyed.loc[common, columns].astype(object)
+    changed_mask = before.ne(after).to_numpy() & ~(before.isna().to_numpy() & after.isna().to_numpy())
+    rows, cols = np.nonzero(changed_mask)
+
+    changed = pd.DataFrame({
+        **{key: common.get_level_values(key)[rows] for key in keys},
+        "column": np.asarray(columns, dtype=object)[cols],
+        "old": before.to_numpy()[rows, cols],
+        "new": after.to_numpy()[rows, cols],
+    })
+    added = new_keyed.loc[new_keyed.index.difference(old_keyed.index)].reset_index(level=keys).reset_index(drop=True)
+    removed = old_keyed.loc[old_keyed.index.difference(new_keyed.index)].reset_index(level=keys).reset_index(drop=True)
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class LivePoller:
+    """Polls one live sheet on a schedule and keeps the latest frame plus its diff"""
+
+    def __init__(self, url, interval=DEFAULT_INTERVAL):
+        self.url = url
+        self.interval = interval
+        self.version = 0
+        self.frame = None
+        self.diff = None
+        self.polled_at = None
+        self.error = None
+        self._last_read = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def poll(self):
+        """Fetch once (conditional request) and record a new version if the data changed"""
+        try:
+            frame = trade_data.load_live(self.url, force=True)
+        except Exception as e:
+            with self._lock:
+                self.error = str(e)
+            return
+        with self._lock:
+            self.error = None
+            self.polled_at = time.time()
+            if frame is not self.frame:
+                self.diff = diff_frames(self.frame, frame) if self.frame is not None else None
+                self.frame = frame
+                self.version += 1
+
+    def _run(self):
+        while time.monotonic() - self._last_read < IDLE_POLLS * self.interval:
+            self.poll()
+            time.sleep(self.interval)
+        with self._lock:
+            self._thread = None
+
+    def ensure_running(self):
+        """Start the polling thread if it is not running (it stops when nobody reads)"""
+        with self._lock:
+            self._last_read = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def latest(self):
+        """
+        Latest state for a reader
+
+        Returns:
+            (version, frame, diff, polled_at) - frame is None before the first poll
+        """
+        self.ensure_running()
+        if self.frame is None:
+            self.poll()
+        with self._lock:
+            return self.version, self.frame, self.diff, self.polled_at
+
+
+def get_poller(url, interval=DEFAULT_INTERVAL):
+    """Process-wide poller for a live sheet URL (shared by all sessions)"""
+    with _lock:
+        poller = _pollers.get(url)
+        if poller is None:
+            poller = _pollers[url] = LivePoller(url, interval)
+        poller.interval = interval
+        return poller
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import trade_data
+
+# -----------------------------
+# PAGED TABLE
+# Server-side search / sort / pagination over the cached typed frame,
+# so only the visible window is sent to the browser
+# -----------------------------
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+UNSORTED = "(sheet order)"
+
+
+def _sort_rank(frame, col, ascending):
+    """Rank of every row when the frame is sorted by col (missing values last)"""
+    order = frame[col].reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order] = np.arange(len(order))
+    return rank
+
+
+def _matches(series, text):
+    """Case-insensitive substring match; categoricals are matched on their categories only"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        hit = series.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+        return np.isin(series.cat.codes.to_numpy(), np.flatnonzero(hit))
+    return series.astype(str).str.contains(text, case=False, regex=False).to_numpy() & series.notna().to_numpy()
+
+
+def window(frame, positions=None, search="", search_columns=None, sort_by=None, ascending=True, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    One page of a (filtered) frame
+
+    Args:
+        frame: Cached frame (not modified)
+        positions: Row positions already selected by the sidebar filters (None for all)
+        search: Text to look for in search_columns (case-insensitive)
+        search_columns: Columns searched (defaults to every non-numeric column)
+        sort_by: Column to sort on (None keeps sheet order)
+        ascending: Sort direction
+        page: 1-based page number (clamped to the last page)
+        page_size: Rows per page
+
+    Returns:
+        (page DataFrame, matched row count, page number actually shown)
+    """
+    positions = np.arange(len(frame)) if positions is None else np.asarray(positions)
+
+    text = search.strip()
+    if text and len(positions):
+        if search_columns is None:
+            search_columns = [col for col in frame.columns if not pd.api.types.is_numeric_dtype(frame[col])]
+        hit = np.zeros(len(frame), dtype=bool)
+        for col in search_columns:
+            hit |= _matches(frame[col], text)
+        positions = positions[hit[positions]]
+
+    if sort_by is not None and len(positions):
+        # Sort order per column is computed once per loaded frame
+        rank = trade_data.derived(frame, ("sort_rank", sort_by, ascending), lambda f: _sort_rank(f, sort_by, ascending))
+        positions = positions[np.argsort(rank[positions], kind="stable")]
+
+    matched = len(positions)
+    last_page = max(1, -(-matched // page_size))
+    page = min(max(1, page), last_page)
+    start = (page - 1) * page_size
+    return frame.iloc[positions[start:start + page_size]], matched, page
+
+
+def render_paged_table(frame, key, positions=None, search_columns=None, page_size=DEFAULT_PAGE_SIZE, **dataframe_kwargs):
+    """
+    st.dataframe replacement that sends only the current page
+
+    Args:
+        frame: Cached frame
+        key: Widget key prefix (one per table on the page)
+        positions: Row positions selected by the sidebar filters (None for all)
+        search_columns: Columns the search box looks in
+        page_size: Default rows per page
+        **dataframe_kwargs: Passed through to st.dataframe (column_config, hide_index, ...)
+    """
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 1, 1, 1])
+    search = col1.text_input("Search", key=f"{key}_search", placeholder="Search...", label_visibility="collapsed")
+    sort_by = col2.selectbox("Sort by", [UNSORTED] + list(frame.columns), key=f"{key}_sort", label_visibility="collapsed")
+    descending = col3.toggle("Desc", key=f"{key}_desc")
+    size = col4.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+                          key=f"{key}_size", label_visibility="collapsed")
+
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1)
+    rows, matched, shown = window(
+        frame, positions, search, search_columns,
+        sort_by=None if sort_by == UNSORTED else sort_by, ascending=not descending,
+        page=page, page_size=size,
+    )
+    if shown != page:
+        st.session_state[page_key] = shown
+    last_page = max(1, -(-matched // size))
+    col5.number_input("Page", min_value=1, max_value=last_page, step=1, key=page_key, label_visibility="collapsed")
+
+    st.dataframe(rows, use_container_width=True, **dataframe_kwargs)
+    start = (shown - 1) * size
+    st.caption(f"Rows {start + 1 if matched else 0}-{start + len(rows)} of {matched:,} · page {shown} of {last_page}")
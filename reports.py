@@ -0,0 +1,221 @@
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import equity_analytics
+import filter_index
+import kpi_cube
+import timing
+import trade_data
+
+# -----------------------------
+# DASHBOARD / LIVE POSITION COMPUTATIONS
+# The numbers behind both pages as a library, plus a headless
+# report generator that writes them for every filter combination
+# -----------------------------
+
+ALL = kpi_cube.ALL
+CAPITAL = 900000
+TARGET_PCT = 30
+FORMATS = ["parquet", "csv", "html"]
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+def dashboard(frame, platform=ALL, strategy=ALL, capital=CAPITAL):
+    """
+    Everything the Dashboard shows for a selection (cached per loaded frame)
+
+    Args:
+        frame: Trade frame normalized with schema.TRADE_SCHEMA
+        platform, strategy: Sidebar selection ("All" for no filter)
+        capital: Starting capital for targets and percentages
+
+    Returns:
+        dict with
+          "positions": selected row positions
+          "cube": kpi_cube.KpiCube for the frame
+          "kpis": cube KPIs plus target, remaining_target, avg_percentage
+          "equity": equity_analytics.compute result for the selection
+    """
+    with timing.span("dashboard.filter"):
+        index = trade_data.derived(frame, "filter_index", lambda f: filter_index.FilterIndex(f, kpi_cube.DIMENSIONS))
+        positions = index.select({"PLATFORM": platform, "STRATEGY": strategy})
+
+    with timing.span("dashboard.kpis"):
+        cube = trade_data.derived(frame, "kpi_cube", kpi_cube.build_cube)
+        kpis = dict(cube.kpis(platform, strategy))
+    target = capital * TARGET_PCT / 100
+    kpis["target"] = target
+    kpis["remaining_target"] = target - kpis["total_profit"]
+    kpis["avg_percentage"] = kpis["total_profit"] / capital * 100 if kpis["total_turnover"] != 0 else 0
+
+    with timing.span("dashboard.equity"):
+        equity = trade_data.derived(
+            frame, ("equity", platform, strategy, capital),
+            lambda f: equity_analytics.compute(filter_index.take(f, positions), capital),
+        )
+    return {"positions": positions, "cube": cube, "kpis": kpis, "equity": equity}
+
+
+def live(frame, market_cap=ALL, strategy=ALL):
+    """
+    Everything the Live Position page shows for a selection
+
+    Args:
+        frame: Live frame normalized with schema.LIVE_SCHEMA
+        market_cap, strategy: Sidebar selection ("All" for no filter)
+
+    Returns:
+        dict with "index" (FilterIndex), "positions", "filtered" (DataFrame)
+        and "kpis": positions, invested, current_value, top_gainer, top_looser
+    """
+    with timing.span("live.filter"):
+        index = trade_data.derived(frame, "filter_index", lambda f: filter_index.FilterIndex(f, ["Market Cap", "Strategy Name", "Broker"]))
+        positions = index.select({"Market Cap": market_cap, "Strategy Name": strategy})
+        filtered = filter_index.take(frame, positions)
+
+    has_gain = "Gain" in filtered.columns
+    kpis = {
+        "positions": len(filtered),
+        "invested": float(filtered["Invested Value"].sum()),
+        "current_value": float(filtered["Current Value"].sum()),
+        "top_gainer": filtered["Gain"].max() if has_gain else None,
+        "top_looser": filtered["Gain"].min() if has_gain else None,
+    }
+    return {"index": index, "positions": positions, "filtered": filtered, "kpis": kpis}
+
+
+# -----------------------------
+# HEADLESS REPORTS
+# -----------------------------
+
+_worker_frames = {}
+
+
+def _init_worker(trades, live_positions, capital):
+    """Process pool initializer: each worker receives the loaded frames once"""
+    pd.set_option("mode.copy_on_write", True)
+    _worker_frames.update(trades=trades, live=live_positions, capital=capital)
+
+
+def _trade_report(selection):
+    """Summary row, monthly and stockwise tables for one (platform, strategy)"""
+    platform, strategy = selection
+    result = dashboard(_worker_frames["trades"], platform, strategy, _worker_frames["capital"])
+    labels = {"PLATFORM": platform, "STRATEGY": strategy}
+
+    summary = {**labels, **result["kpis"]}
+    summary.update({k: v for k, v in result["equity"]["metrics"].items() if k not in ("trades", "capital")})
+    monthly = result["cube"].monthly_profit(platform, strategy).reset_index().assign(**labels)
+    stockwise = result["cube"].stockwise(platform, strategy).assign(**labels)
+    return summary, monthly, stockwise
+
+
+def _live_report(selection):
+    market_cap, strategy = selection
+    result = live(_worker_frames["live"], market_cap, strategy)
+    return {"Market Cap": market_cap, "Strategy Name": strategy, **result["kpis"]}
+
+
+def _selections(frame, dims):
+    options = [[ALL] + [value for value in frame[dim].cat.categories] for dim in dims]
+    return list(itertools.product(*options))
+
+
+def _leading(frame, columns):
+    return frame[columns + [col for col in frame.columns if col not in columns]]
+
+
+def build_reports(trades, live_positions=None, capital=CAPITAL, workers=DEFAULT_WORKERS):
+    """
+    Dashboard (and Live Position) reports for every filter combination
+
+    Combinations are computed in a process pool; each worker gets the
+    frames once and builds its own cube.
+
+    Args:
+        trades: Trade frame normalized with schema.TRADE_SCHEMA
+        live_positions: Optional live frame normalized with schema.LIVE_SCHEMA
+        capital: Starting capital
+        workers: Worker processes (1 runs in-process)
+
+    Returns:
+        dict of report name ("summary", "monthly", "stockwise", "live") to DataFrame
+    """
+    trade_selections = _selections(trades, kpi_cube.DIMENSIONS)
+    live_selections = _selections(live_positions, ["Market Cap", "Strategy Name"]) if live_positions is not None else []
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(trades, live_positions, capital)) as pool:
+            trade_results = list(pool.map(_trade_report, trade_selections, chunksize=4))
+            live_results = list(pool.map(_live_report, live_selections, chunksize=4))
+    else:
+        _init_worker(trades, live_positions, capital)
+        trade_results = [_trade_report(selection) for selection in trade_selections]
+        live_results = [_live_report(selection) for selection in live_selections]
+
+    labels = ["PLATFORM", "STRATEGY"]
+    reports = {
+        "summary": pd.DataFrame([summary for summary, _, _ in trade_results]),
+        "monthly": _leading(pd.concat([monthly for _, monthly, _ in trade_results], ignore_index=True), labels),
+        "stockwise": _leading(pd.concat([stockwise for _, _, stockwise in trade_results], ignore_index=True), labels),
+    }
+    if live_results:
+        reports["live"] = pd.DataFrame(live_results)
+    return reports
+
+
+def write_reports(reports, out_dir, formats=("csv",)):
+    """
+    Write each report as <out_dir>/<name>.<format>
+
+    Returns:
+        List of written paths
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, table in reports.items():
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            if fmt == "parquet":
+                table.to_parquet(path, index=False)
+            elif fmt == "csv":
+                table.to_csv(path, index=False)
+            elif fmt == "html":
+                table.to_html(path, index=False, float_format=lambda v: f"{v:,.2f}", na_rep="")
+            else:
+                raise ValueError(f"Unknown report format: {fmt}")
+            paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    """CLI entry point: python reports.py --csv-url URL --live-url URL --format parquet html --out reports/"""
+    parser = argparse.ArgumentParser(description="Write Dashboard / Live Position reports for every platform, strategy and month.")
+    parser.add_argument("--csv-url", required=True, help="Trade-history CSV export URL")
+    parser.add_argument("--live-url", help="Live-position CSV export URL")
+    parser.add_argument("--since", help="Only trades exiting on or after this date (e.g. 2025-01-01 for a weekly summary)")
+    parser.add_argument("--capital", type=float, default=CAPITAL)
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["csv"])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--out", default="reports", help="Output directory")
+    args = parser.parse_args(argv)
+    pd.set_option("mode.copy_on_write", True)  # same pandas semantics as the app
+
+    trades = trade_data.load_trades(args.csv_url)
+    if args.since:
+        trades = trades[trades["EXIT DATE"] >= pd.Timestamp(args.since)].reset_index(drop=True)
+    live_positions = trade_data.load_live(args.live_url) if args.live_url else None
+
+    reports = build_reports(trades, live_positions, capital=args.capital, workers=args.workers)
+    for path in write_reports(reports, args.out, args.format):
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
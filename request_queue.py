@@ -0,0 +1,240 @@
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+import timing
+
+# -----------------------------
+# AI REQUEST QUEUE
+# Process-wide limiter in front of the OpenAI calls: FIFO queue with
+# a concurrency cap, per-user and per-model token buckets, and
+# exponential backoff on rate-limit / transient errors
+# -----------------------------
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_USER_RPM = 10       # requests per minute per user
+DEFAULT_USER_BURST = 3
+DEFAULT_MODEL_RPM = 60      # requests per minute per model (whole app)
+DEFAULT_MODEL_BURST = 10
+MAX_ATTEMPTS = 4            # tries per request (aikey.max_attempts)
+BACKOFF_BASE = 1.0          # seconds, doubled per attempt (+ jitter)
+BACKOFF_MAX = 30.0
+MAX_WAIT = 120.0            # give up instead of queueing longer than this
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+RECENT_WAITS = 200
+
+_queue = None
+_lock = threading.Lock()
+
+
+class RateLimited(Exception):
+    """Raised when a request would wait longer than MAX_WAIT for its turn"""
+
+
+class TokenBucket:
+    """Refills `per_minute` tokens per minute up to `burst`; reservations may go negative"""
+
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; returns seconds until it is actually available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 and self.rate else 0.0
+
+    def cancel(self):
+        """Give back a reservation that will not be used"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+def _retryable(error):
+    status = getattr(error, "status_code", None)
+    return status in RETRY_STATUSES or type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(error):
+    """Seconds from a Retry-After header, if the error carries one"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RequestQueue:
+    """Shared limiter for chat completions across sessions and batch runs"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, user_rpm=DEFAULT_USER_RPM, model_rpm=DEFAULT_MODEL_RPM,
+                 max_attempts=MAX_ATTEMPTS, max_wait=MAX_WAIT):
+        self.concurrency = concurrency
+        self.user_rpm = user_rpm
+        self.model_rpm = model_rpm
+        self.max_attempts = max_attempts
+        self.max_wait = max_wait
+        self._buckets = {}
+        self._waiting = deque()
+        self._active = 0
+        self._cond = threading.Condition()
+        self._waits = deque(maxlen=RECENT_WAITS)
+        self._counts = {"completed": 0, "failed": 0, "retries": 0, "rejected": 0}
+
+    def _bucket(self, key, per_minute, burst):
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.rate != per_minute / 60.0:
+                bucket = self._buckets[key] = TokenBucket(per_minute, burst)
+            return bucket
+
+    def _throttle(self, user, model):
+        """Wait for the user's and the model's token buckets"""
+        buckets = [self._bucket(("model", model), self.model_rpm, DEFAULT_MODEL_BURST)]
+        if user is not None:
+            buckets.append(self._bucket(("user", user), self.user_rpm, DEFAULT_USER_BURST))
+        delays = [bucket.reserve() for bucket in buckets]
+        delay = max(delays)
+        if delay > self.max_wait:
+            for bucket in buckets:
+                bucket.cancel()
+            with self._cond:
+                self._counts["rejected"] += 1
+            raise RateLimited(f"Too many requests - try again in {delay:.0f}s")
+        if delay:
+            time.sleep(delay)
+
+    def _acquire(self):
+        """Take a slot, first come first served"""
+        ticket = object()
+        with self._cond:
+            self._waiting.append(ticket)
+            while self._waiting[0] is not ticket or self._active >= self.concurrency:
+                self._cond.wait()
+            self._waiting.popleft()
+            self._active += 1
+            self._cond.notify_all()
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _enter(self, user, model):
+        start = time.perf_counter()
+        self._throttle(user, model)
+        self._acquire()
+        waited = time.perf_counter() - start
+        with self._cond:
+            self._waits.append(waited)
+        timing.record("ai.queue_wait", waited * 1000, model=model)
+
+    def _backoff(self, error, attempt):
+        """Sleep before the next attempt, or re-raise when out of attempts / not retryable"""
+        if attempt + 1 >= self.max_attempts or not _retryable(error):
+            with self._cond:
+                self._counts["failed"] += 1
+            raise error
+        delay = _retry_after(error)
+        if delay is None:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+        with self._cond:
+            self._counts["retries"] += 1
+        time.sleep(delay)
+
+    def submit(self, call, user=None, model=None):
+        """
+        Run call() when the limits allow, retrying transient failures
+
+        Args:
+            call: Zero-argument callable making the API request
+            user: Per-user bucket key (None for no per-user limit)
+            model: Per-model bucket key
+
+        Returns:
+            call()'s result (its exception once retries are exhausted)
+        """
+        for attempt in range(self.max_attempts):
+            self._enter(user, model)
+            try:
+                result = call()
+            except Exception as e:
+                self._release()
+                self._backoff(e, attempt)
+                continue
+            self._release()
+            with self._cond:
+                self._counts["completed"] += 1
+            return result
+
+    def stream(self, call, user=None, model=None):
+        """
+        Streaming variant of submit: call() returns an iterator, whose items
+        are yielded while the slot is held. Only failures before the first
+        item are retried.
+        """
+        for attempt in range(self.max_attempts):
+            self._enter(user, model)
+            started = False
+            try:
+                for item in call():
+                    started = True
+                    yield item
+            except Exception as e:
+                self._release()
+                if started:
+                    with self._cond:
+                        self._counts["failed"] += 1
+                    raise
+                self._backoff(e, attempt)
+                continue
+            except BaseException:
+                self._release()  # generator closed early
+                raise
+            self._release()
+            with self._cond:
+                self._counts["completed"] += 1
+            return
+
+    def stats(self):
+        """
+        Queue metrics
+
+        Returns:
+            dict with depth, active, concurrency, wait_p50/wait_p95 (seconds,
+            recent requests), completed, failed, retries, rejected
+        """
+        with self._cond:
+            waits = list(self._waits)
+            stats = {"depth": len(self._waiting), "active": self._active, "concurrency": self.concurrency, **self._counts}
+        stats["wait_p50"] = float(np.percentile(waits, 50)) if waits else 0.0
+        stats["wait_p95"] = float(np.percentile(waits, 95)) if waits else 0.0
+        return stats
+
+
+def get_queue(concurrency=None, user_rpm=None, model_rpm=None, max_attempts=None):
+    """Process-wide request queue (settings given here update it; max_attempts is the retry setting)"""
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = RequestQueue()
+        if concurrency is not None:
+            with _queue._cond:
+                _queue.concurrency = concurrency
+                _queue._cond.notify_all()
+        if user_rpm is not None:
+            _queue.user_rpm = user_rpm
+        if model_rpm is not None:
+            _queue.model_rpm = model_rpm
+        if max_attempts is not None:
+            _queue.max_attempts = max(1, int(max_attempts))
+        return _queue
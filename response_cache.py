@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# -----------------------------
+# AI RESPONSE CACHE
+# Repeated stock questions are answered from a local SQLite store,
+# shared by every session and surviving restarts
+# -----------------------------
+
+CACHE_PATH = os.path.join(".cache", "responses.sqlite3")
+DEFAULT_TTL = 6 * 3600   # seconds an answer stays valid (prices move)
+MAX_ENTRIES = 500        # least recently used answers are evicted beyond this
+
+# Keyword -> intent; first match wins, anything else is a general analysis
+INTENTS = [
+    ("compare", {"VS", "VERSUS", "COMPARE", "BETTER"}),
+    ("valuation", {"OVERVALUED", "UNDERVALUED", "VALUATION", "VALUED", "EXPENSIVE", "CHEAP"}),
+    ("trade", {"BUY", "SELL", "HOLD", "ENTRY", "TARGET", "STOP", "TRADING", "TRADE"}),
+]
+
+# Words that never name a stock
+_STOPWORDS = {
+    "A", "ABOUT", "ALSO", "AN", "AND", "ANALYSE", "ANALYSIS", "ANALYZE", "ARE", "AT", "BE", "BETTER",
+    "BUY", "CAN", "CHEAP", "COMPARE", "CURRENT", "DO", "DOES", "ENTRY", "EXPENSIVE", "FOR",
+    "FUNDAMENTAL", "FUNDAMENTALS", "GIVE", "GOOD", "HOLD", "HOW", "I", "IN", "IS", "IT", "LEVEL",
+    "LEVELS", "LOSS", "ME", "MY", "NOW", "OF", "ON", "OR", "OVERVALUED", "PLEASE", "PRICE", "SELL",
+    "SHARE", "SHARES", "SHOULD", "STOCK", "STOCKS", "STOP", "TARGET", "TELL", "THE", "THIS", "TO",
+    "TODAY", "TRADE", "TRADING", "UNDERVALUED", "VALUATION", "VALUED", "VERSUS", "VS", "WE", "WHAT",
+    "WHICH", "WITH", "ITS", "THAT", "THEM", "THEN", "THEY", "WHEN", "WHERE", "WHO", "WHY",
+}
+_SPLIT_WORDS = {"VS", "VERSUS", "AND", "OR"}
+
+
+def _looks_like_ticker(words):
+    """A name is taken as a ticker when one of its words was typed in capitals ("TCS", "HDFC Bank")"""
+    return any(len(word) > 1 and word == word.upper() and any(c.isalnum() for c in word) for word in words)
+
+
+def normalize_question(question):
+    """
+    Reduce a question to (tickers, intent)
+
+    "Should I buy TCS at current price?" -> (("TCS",), "trade")
+    "INFY vs TCS which is better?"       -> (("INFY", "TCS"), "compare")
+    "Why?" / "What about its stop loss?" -> None (no ticker named)
+
+    Returns:
+        (tuple of ticker names, intent), or None when no stock is named
+    """
+    typed = re.findall(r"[A-Za-z0-9&.-]+", question)
+    words = [word.upper() for word in typed]
+    intent = next((name for name, keywords in INTENTS if keywords & set(words)), "analysis")
+
+    # Consecutive non-stopwords form one name ("HDFC BANK"); split words separate names
+    names, current = [], []
+    for word, original in zip(words + ["VS"], typed + ["VS"]):
+        if word in _STOPWORDS or word in _SPLIT_WORDS:
+            if current and _looks_like_ticker([w for _, w in current]):
+                names.append(" ".join(w for w, _ in current))
+            current = []
+        elif word.strip(".-"):
+            current.append((word.strip(".-"), original.strip(".-")))
+    if not names:
+        return None
+    return tuple(sorted(set(names))), intent
+
+
+def make_key(question, model, system_prompt, context=None):
+    """
+    Cache key for a question: normalized tickers + intent + model + system-prompt hash
+
+    Args:
+        question: The user's question
+        model: Model name
+        system_prompt: System prompt text
+        context: Prior turns sent with the question (the packed messages);
+            answers to follow-ups depend on them, so they are part of the key
+
+    Returns:
+        Hex key, or None when the question should not be cached
+    """
+    normalized = normalize_question(question)
+    if normalized is None:
+        return None
+    tickers, intent = normalized
+    prompt_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+    context_hash = hashlib.sha256(json.dumps(context).encode()).hexdigest() if context else None
+    raw = json.dumps([tickers, intent, model, prompt_hash, context_hash])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed TTL + LRU cache of AI answers with hit/miss counters
+
+    `ttl` is the default; callers with their own freshness setting pass
+    ttl to get/put instead of changing the shared instance.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._db.commit()
+
+    def get(self, key, ttl=None):
+        """Cached answer for a key younger than ttl seconds, or None (expired entries count as misses)"""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at > ?", (key, now - ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, response, ttl=None):
+        """Store an answer, then drop expired and least recently used entries"""
+        now = time.time()
+        # Another caller may reuse answers for longer than this one does
+        ttl = self.ttl if ttl is None else max(ttl, self.ttl)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._db.execute("DELETE FROM responses WHERE created_at <= ?", (now - ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN"
+                " (SELECT key FROM responses ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def stats(self):
+        """
+        Counters for display
+
+        Returns:
+            dict with hits, misses, hit_rate (%) and entries
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups * 100 if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path=CACHE_PATH):
+    """Process-wide ResponseCache for a store path (shared across sessions - pass ttl to get/put)"""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = ResponseCache(path)
+        return cache
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+import reports
+import trade_data
+
+# -----------------------------
+# WHAT-IF SCENARIOS
+# Portfolio P&L across grids of price moves on the live positions,
+# vectorized with NumPy broadcasting and cached per scenario
+# -----------------------------
+
+KINDS = {
+    "uniform": "Uniform shock",
+    "market_cap": "By market cap",
+    "stock": "Per stock",
+    "target": "Toward targets",
+}
+DEFAULT_MOVES = tuple(range(-20, 21, 2))   # % price moves
+TARGET_FRACTIONS = tuple(np.round(np.linspace(0, 1, 11), 2))
+MAX_CELLS = 2_000_000                      # scenarios x positions evaluated at once
+OTHER = "Other"
+
+
+def _positions(live):
+    current = np.nan_to_num(live["Current Value"].to_numpy(dtype="float64"))
+    invested = np.nan_to_num(live["Invested Value"].to_numpy(dtype="float64"))
+    return current, invested
+
+
+def _progress(unrealised, realised, capital):
+    """Realised + unrealised P&L as % of the capital target"""
+    target = capital * reports.TARGET_PCT / 100
+    return (realised + unrealised) / target * 100 if target else np.full(np.shape(unrealised), np.nan)
+
+
+def _portfolio_table(index, value, invested, realised, capital):
+    unrealised = value - invested
+    return pd.DataFrame({
+        "Portfolio Value": value,
+        "Unrealised P&L": unrealised,
+        "Target Progress %": _progress(unrealised, realised, capital),
+    }, index=index)
+
+
+def _uniform(live, moves, realised, capital):
+    current, invested = _positions(live)
+    shocks = np.asarray(moves, dtype="float64") / 100
+    value = (current[None, :] * (1 + shocks[:, None])).sum(axis=1)
+    return {"table": _portfolio_table(pd.Index(moves, name="Move %"), value, invested.sum(), realised, capital)}
+
+
+def _toward_targets(live, fractions, realised, capital):
+    """Each position moves the given fraction of the way to its Potential Gain"""
+    current, invested = _positions(live)
+    potential = np.nan_to_num(live["Potential Gain"].to_numpy(dtype="float64")) / 100
+    fractions = np.asarray(fractions, dtype="float64")
+    value = (current[None, :] * (1 + fractions[:, None] * potential[None, :])).sum(axis=1)
+    return {"table": _portfolio_table(pd.Index(fractions * 100, name="% of way to target"), value, invested.sum(), realised, capital)}
+
+
+def _per_stock(live, moves, realised, capital):
+    """Unrealised P&L of each position at each move (the other positions flat)"""
+    current, invested = _positions(live)
+    shocks = np.asarray(moves, dtype="float64") / 100
+    position_pnl = current[:, None] * (1 + shocks[None, :]) - invested[:, None]
+    table = pd.DataFrame(position_pnl, columns=pd.Index(moves, name="Move %"))
+    table.insert(0, "Stock", live["Stock"].to_numpy())
+    portfolio_change = current[:, None] * shocks[None, :]
+    base = (current - invested).sum()
+    progress = pd.DataFrame(_progress(base + portfolio_change, realised, capital), columns=pd.Index(moves, name="Move %"))
+    progress.insert(0, "Stock", live["Stock"].to_numpy())
+    return {"table": table, "progress": progress}
+
+
+def _by_market_cap(live, moves, realised, capital):
+    """
+    Every combination of one move per market-cap bucket
+
+    Portfolio P&L is linear in the moves, so the surface is the base P&L plus
+    each bucket's value times its move, broadcast along that bucket's axis.
+    """
+    current, invested = _positions(live)
+    caps = live["Market Cap"]
+    codes = caps.cat.codes.to_numpy() if isinstance(caps.dtype, pd.CategoricalDtype) else pd.Categorical(caps).codes
+    labels = list(caps.cat.categories if isinstance(caps.dtype, pd.CategoricalDtype) else pd.Categorical(caps).categories)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(labels), codes)
+        labels.append(OTHER)
+    bucket_value = np.bincount(codes, weights=current, minlength=len(labels))
+    present = bucket_value != 0
+    labels = [label for label, keep in zip(labels, present) if keep]
+    bucket_value = bucket_value[present]
+
+    shocks = np.asarray(moves, dtype="float64") / 100
+    if len(shocks) ** len(labels) > MAX_CELLS:
+        raise ValueError(f"{len(shocks)} moves over {len(labels)} buckets is too large a grid")
+
+    surface = np.full((len(shocks),) * len(labels), (current - invested).sum())
+    for axis, value in enumerate(bucket_value):
+        shape = [1] * len(labels)
+        shape[axis] = len(shocks)
+        surface = surface + (value * shocks).reshape(shape)
+
+    # One bucket moving while the others stay flat
+    by_bucket = pd.DataFrame(
+        (current - invested).sum() + bucket_value[None, :] * shocks[:, None],
+        index=pd.Index(moves, name="Move %"), columns=labels,
+    )
+    return {
+        "buckets": labels,
+        "surface": surface,
+        "progress": _progress(surface, realised, capital),
+        "by_bucket": by_bucket,
+    }
+
+
+_BUILDERS = {"uniform": _uniform, "market_cap": _by_market_cap, "stock": _per_stock, "target": _toward_targets}
+
+
+def evaluate(live, kind="uniform", moves=None, realised=0.0, capital=reports.CAPITAL):
+    """
+    Evaluate a what-if scenario over the live positions (cached per definition)
+
+    Args:
+        live: Frame normalized with schema.LIVE_SCHEMA
+        kind: One of KINDS
+        moves: % price moves (fractions of the way to target, 0-1, for "target")
+        realised: Realised profit already booked, counted toward the target
+        capital: Capital the 30% target is set on
+
+    Returns:
+        dict - "uniform"/"target": "table" (value, unrealised P&L, target
+        progress per move); "stock": "table" and "progress" (position x move);
+        "market_cap": "buckets", "surface" and "progress" (one axis per
+        bucket) and "by_bucket" (one bucket moving at a time)
+    """
+    if kind not in _BUILDERS:
+        raise ValueError(f"Unknown scenario kind: {kind}")
+    if moves is None:
+        moves = TARGET_FRACTIONS if kind == "target" else DEFAULT_MOVES
+    moves = tuple(float(m) for m in moves)
+    if kind != "market_cap" and len(moves) * len(live) > MAX_CELLS:
+        raise ValueError(f"{len(moves)} moves over {len(live)} positions is too large a grid")
+
+    key = ("scenario", kind, moves, float(realised), float(capital))
+    return trade_data.derived(live, key, lambda frame: _BUILDERS[kind](frame, moves, realised, capital))
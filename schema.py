@@ -0,0 +1,101 @@
+import pandas as pd
+
+# -----------------------------
+# SHEET SCHEMAS
+# Declared dtypes for the trade-history and live-position sheets,
+# applied once at load time
+# -----------------------------
+
+TRADE_SCHEMA = {
+    "ENTRY DATE": "datetime",
+    "EXIT DATE": "datetime",
+    "SCRIPT": "category",
+    "STRATEGY": "category",
+    "PLATFORM": "category",
+    "INVESTED": "float",
+    "PROFIT/ABS": "float",
+    "PROFIT/%": "float",
+    "EQUITY CURVE": "float",
+}
+
+LIVE_SCHEMA = {
+    "Stock": "text",
+    "Strategy Name": "category",
+    "Market Cap": "category",
+    "Broker": "category",
+    "Gain": "float",
+    "Current Value": "float",
+    "Invested Value": "float",
+    "Target Price": "float",
+    "Potential Gain": "float",
+    "Remaining Gain": "float",
+}
+
+# Column dtype each kind ends up as after normalize
+_DTYPES = {
+    "datetime": "datetime64[ns]",
+    "category": "category",
+    "float": "float64",
+    "text": "object",
+}
+
+# Formatting the sheets add around numbers ("₹1,23,456.00", "12.5%")
+_NUMBER_NOISE = r"[₹$,%\s]"
+
+
+def _to_float(column):
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype("float64")
+    cleaned = column.astype("string").str.replace(_NUMBER_NOISE, "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+
+def _to_text(column):
+    return column.where(column.isna(), column.astype(str).str.strip())
+
+
+def _convert(column, kind):
+    if kind == "datetime":
+        return pd.to_datetime(column, errors="coerce")
+    if kind == "category":
+        return _to_text(column).astype("category")
+    if kind == "float":
+        return _to_float(column)
+    if kind == "text":
+        return _to_text(column)
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def normalize(frame, schema):
+    """
+    Coerce a raw sheet frame to its declared dtypes in one pass
+
+    Args:
+        frame: DataFrame as parsed from the CSV
+        schema: Mapping of column name to kind (datetime/category/float/text)
+
+    Returns:
+        New DataFrame; columns not in the schema are passed through unchanged
+    """
+    return pd.DataFrame(
+        {
+            col: _convert(frame[col], schema[col]) if col in schema else frame[col]
+            for col in frame.columns
+        },
+        index=frame.index,
+    )
+
+
+def normalize_trades(frame):
+    """Apply TRADE_SCHEMA to a trade-history frame"""
+    return normalize(frame, TRADE_SCHEMA)
+
+
+def normalize_live(frame):
+    """Apply LIVE_SCHEMA to a live-position frame"""
+    return normalize(frame, LIVE_SCHEMA)
+
+
+def dtypes(schema):
+    """Column -> dtype name a frame normalized with the schema has (e.g. to validate a stored copy)"""
+    return {col: _DTYPES[kind] for col, kind in schema.items()}
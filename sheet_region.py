@@ -0,0 +1,137 @@
+import csv
+import io
+import re
+
+import pandas as pd
+
+# -----------------------------
+# SHEET REGION DETECTOR
+# Finds a table inside a Google Sheets CSV export by its column
+# signature instead of hard-coded skiprows / iloc offsets
+# -----------------------------
+
+_NUMBER = re.compile(r"^[₹$]?\s*-?[\d,]*\.?\d+\s*%?$")
+
+
+def _rows(body):
+    """Stream CSV rows from raw bytes without building a frame"""
+    return csv.reader(io.TextIOWrapper(io.BytesIO(body), encoding="utf-8-sig", newline=""))
+
+
+def _cell(row, position):
+    return row[position].strip() if position < len(row) else ""
+
+
+class _Signature:
+    """Where the wanted columns sit in the header, and what a data row looks like"""
+
+    def __init__(self, header, columns, key_column, numeric_column):
+        cells = [cell.strip() for cell in header]
+        self.positions = [cells.index(col) for col in columns]
+        self.key = cells.index(key_column)
+        self.key_name = key_column
+        self.numeric = cells.index(numeric_column) if numeric_column else None
+
+    def is_data(self, row):
+        key = _cell(row, self.key)
+        if not key or key == self.key_name:
+            return False
+        return self.numeric is None or bool(_NUMBER.match(_cell(row, self.numeric)))
+
+    def values(self, row):
+        return [_cell(row, position) or None for position in self.positions]
+
+
+def _matches(header, columns):
+    cells = {cell.strip() for cell in header}
+    return all(col in cells for col in columns)
+
+
+def _from_region(body, columns, key_column, numeric_column, region, skip, limit):
+    """Parse only the rows of a previously detected region; None if the layout moved"""
+    signature, records, counted = None, [], 0
+    for row_no, row in enumerate(_rows(body)):
+        if row_no == region["header"]:
+            if not _matches(row, columns):
+                return None
+            signature = _Signature(row, columns, key_column, numeric_column)
+        elif signature is None:
+            continue
+        elif row_no < region["start"]:
+            if row:
+                counted += 1
+                if counted > skip and signature.is_data(row):
+                    return None  # block now starts earlier
+        elif row_no < region["stop"]:
+            if not signature.is_data(row):
+                return None
+            records.append(signature.values(row))
+        else:
+            if (limit is None or len(records) < limit) and signature.is_data(row):
+                return None  # block now extends further
+            break
+    if signature is None or counted < skip or len(records) != region["stop"] - region["start"]:
+        return None
+    return records
+
+
+def read_region(body, columns, key_column, numeric_column=None, region=None, skip=0, limit=None):
+    """
+    Parse the data block under the header row that contains `columns`
+
+    The CSV is scanned once: the header is the first row containing every
+    wanted column; data rows are rows with a non-empty key cell (and a
+    number in numeric_column). The block is the first contiguous run of
+    data rows once `skip` rows under the header have been passed over,
+    cut at `limit` rows. Like read_csv(skip_blank_lines=True), empty lines
+    are not counted towards `skip`. With a cached region only that range
+    is parsed, after checking its boundaries.
+
+    Args:
+        body: Raw CSV bytes
+        columns: Columns to return
+        key_column: Column that is filled on every data row (e.g. "Stock")
+        numeric_column: Column that must hold a number on data rows (optional)
+        region: Previously detected region to try first
+        skip: Rows under the header that precede the block
+        limit: Max rows in the block (None for no limit)
+
+    Returns:
+        (DataFrame of strings/None, region dict with header/start/stop row numbers)
+    """
+    if region is not None:
+        records = _from_region(body, columns, key_column, numeric_column, region, skip, limit)
+        if records is not None:
+            return pd.DataFrame(records, columns=columns), region
+
+    signature, header_row = None, None
+    start, stop, records = None, None, []
+    counted = 0
+    row_no = -1
+    for row_no, row in enumerate(_rows(body)):
+        if signature is None:
+            if _matches(row, columns):
+                signature = _Signature(row, columns, key_column, numeric_column)
+                header_row = row_no
+            continue
+        if start is None:
+            if row:
+                counted += 1
+                if counted > skip and signature.is_data(row):
+                    start = row_no
+                    records.append(signature.values(row))
+            continue
+        if not signature.is_data(row) or (limit is not None and len(records) >= limit):
+            stop = row_no
+            break
+        records.append(signature.values(row))
+
+    if signature is None:
+        raise ValueError(f"No header row with columns {columns}")
+
+    if start is None:
+        start = stop = header_row + 1
+    elif stop is None:
+        stop = row_no + 1
+    region = {"header": header_row, "start": start, "stop": stop}
+    return pd.DataFrame(records, columns=columns), region
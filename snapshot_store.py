@@ -0,0 +1,236 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+# -----------------------------
+# LOCAL PARQUET SNAPSHOTS
+# Append-only on-disk copy of the trade history for fast cold starts
+# -----------------------------
+
+SNAPSHOT_DIR = os.path.join(".cache", "snapshots")
+MAX_PARTS = 20  # compact into a single file beyond this many appended parts
+
+_state = {}
+_lock = threading.Lock()
+
+
+def _dataset_dir(name, root):
+    return os.path.join(root, name)
+
+
+def _meta_path(name, root):
+    return os.path.join(_dataset_dir(name, root), "_meta.json")
+
+
+def _row_hashes(frame):
+    """Stable per-row hashes, independent of the index"""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _dtypes(frame):
+    """Column -> dtype name, stored in the meta so untyped/old-format snapshots are not served"""
+    return {col: str(dtype) for col, dtype in frame.dtypes.items()}
+
+
+def _digest(row_hashes):
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def _read_meta(name, root):
+    try:
+        with open(_meta_path(name, root)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_meta(name, root, meta):
+    def write(path):
+        with open(path, "w") as f:
+            json.dump(meta, f)
+
+    _write_atomic(_meta_path(name, root), write)
+
+
+def _write_part(name, root, part_no, frame):
+    path = os.path.join(_dataset_dir(name, root), f"part-{part_no:05d}.parquet")
+    _write_atomic(path, lambda tmp: frame.to_parquet(tmp, index=False))
+
+
+def read_snapshot(name, root=SNAPSHOT_DIR, dtypes=None):
+    """
+    Read the last persisted snapshot
+
+    Args:
+        name: Dataset name (e.g. "trades")
+        root: Snapshot directory
+        dtypes: Expected column -> dtype name (see schema.dtypes); a snapshot
+            written with other dtypes is ignored
+
+    Returns:
+        DataFrame, or None when no (matching) snapshot exists yet
+    """
+    meta = _read_meta(name, root)
+    if meta is None:
+        return None
+    if dtypes is not None and meta.get("dtypes") != dict(dtypes):
+        return None
+
+    paths = sorted(glob.glob(os.path.join(_dataset_dir(name, root), "part-*.parquet")))
+    parts = [pd.read_parquet(path) for path in paths[:meta["parts"]]]
+    if not parts:
+        return None
+    if len(parts) == 1:
+        return parts[0]
+
+    frame = pd.concat(parts, ignore_index=True)
+    # Parts carry their own category sets; concat falls back to object for those
+    for col, dtype in parts[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype("category")
+    return frame
+
+
+def sync(name, frame, root=SNAPSHOT_DIR):
+    """
+    Bring the snapshot in line with a freshly loaded frame
+
+    The sheet only grows, so when the already-persisted rows are unchanged
+    only the new tail is written as an extra part. Any edit to older rows
+    (or too many parts) rewrites the snapshot as a single file.
+
+    Args:
+        name: Dataset name
+        frame: Full, freshly loaded DataFrame
+        root: Snapshot directory
+
+    Returns:
+        Number of rows written
+    """
+    os.makedirs(_dataset_dir(name, root), exist_ok=True)
+    meta = _read_meta(name, root)
+    row_hashes = _row_hashes(frame)
+
+    if (
+        meta is not None
+        and meta["columns"] == list(frame.columns)
+        and meta.get("dtypes") == _dtypes(frame)
+        and meta["rows"] <= len(frame)
+        and meta["parts"] < MAX_PARTS
+        and _digest(row_hashes[:meta["rows"]]) == meta["digest"]
+    ):
+        if meta["rows"] == len(frame):
+            return 0
+        new_rows = frame.iloc[meta["rows"]:]
+        _write_part(name, root, meta["parts"], new_rows)
+        parts = meta["parts"] + 1
+        written = len(new_rows)
+    else:
+        for path in glob.glob(os.path.join(_dataset_dir(name, root), "part-*.parquet")):
+            os.remove(path)
+        _write_part(name, root, 0, frame)
+        parts = 1
+        written = len(frame)
+
+    _write_meta(name, root, {
+        "columns": list(frame.columns),
+        "dtypes": _dtypes(frame),
+        "rows": len(frame),
+        "digest": _digest(row_hashes),
+        "parts": parts,
+    })
+    return written
+
+
+def _reconcile(name, fetch, root, state):
+    """Background worker: fetch the remote data and persist any new rows"""
+    try:
+        frame = fetch()
+        sync(name, frame, root)
+        with _lock:
+            state["synced"] = frame
+            state["reconciled"] = True
+            state["snapshot"] = None
+            state["error"] = None
+    except Exception as e:
+        with _lock:
+            state["error"] = str(e)
+    finally:
+        with _lock:
+            state["thread"] = None
+
+
+def serve(name, fetch, root=SNAPSHOT_DIR, dtypes=None):
+    """
+    Startup path: serve the last snapshot immediately, reconcile in the background
+
+    On a cold process the snapshot (if any) is returned right away while a
+    background thread fetches the remote data and appends new rows. Once
+    reconciled, fetch() is served directly (it is expected to be cached) and
+    the snapshot is updated whenever it returns a different frame.
+
+    Args:
+        name: Dataset name
+        fetch: Callable returning the full, current DataFrame
+        root: Snapshot directory
+        dtypes: Expected column -> dtype name; a snapshot written with other
+            dtypes (e.g. before the schema was applied) is not served
+
+    Returns:
+        DataFrame
+    """
+    with _lock:
+        state = _state.setdefault(name, {
+            "synced": None, "reconciled": False, "snapshot": None, "thread": None, "error": None,
+        })
+        reconciled = state["reconciled"]
+
+    if reconciled:
+        frame = fetch()
+        with _lock:
+            changed = frame is not state["synced"] and state["thread"] is None
+            if changed:
+                state["thread"] = threading.Thread(
+                    target=_reconcile, args=(name, lambda: frame, root, state), daemon=True,
+                )
+                state["thread"].start()
+        return frame
+
+    if state["snapshot"] is None:
+        state["snapshot"] = read_snapshot(name, root, dtypes)
+
+    if state["snapshot"] is None:
+        # Nothing on disk yet - load synchronously and write the first snapshot
+        frame = fetch()
+        _reconcile(name, lambda: frame, root, state)
+        return frame
+
+    with _lock:
+        if state["thread"] is None:
+            state["thread"] = threading.Thread(
+                target=_reconcile, args=(name, fetch, root, state), daemon=True,
+            )
+            state["thread"].start()
+    return state["snapshot"]
+
+
+def status(name):
+    """
+    Snapshot status for display
+
+    Returns:
+        dict with "reconciled" (serving live data) and "error" (last failure)
+    """
+    with _lock:
+        state = _state.get(name, {})
+        return {"reconciled": state.get("reconciled", False), "error": state.get("error")}
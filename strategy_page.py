@@ -0,0 +1,90 @@
+import streamlit as st
+
+# -----------------------------
+# STRATEGY PAGE
+# Static strategy notes
+# -----------------------------
+
+
+def render():
+    """Render the Strategy page"""
+    with st.expander("Reverse Head & Shoulders"):
+        st.markdown("""
+        In a world full of **complex indicators**, we keep it **simple** by focusing on  **Price Action** and **Quality**.
+        Most textbooks teach the Reverse Head & Shoulders (RHS) pattern in a way that leads to many **fake-outs**.
+        This approach uses **strict filters** so we only participate in **high-probability trades**. """)
+
+        st.divider()
+
+        # --------------------------------------------------
+        # Section 1
+        # --------------------------------------------------
+        st.subheader("🧬 1. The Anatomy of a Perfect Pattern")
+
+        st.markdown("""
+        A standard Reverse Head & Shoulders has:
+        - A **Left Shoulder**
+        - A **Head** (the lowest point)
+        - A **Right Shoulder**
+
+        However, for us to consider it a **RHS**, it must meet **strict criteria**. """)
+
+        st.subheader("📏 The 180-Degree Neckline")
+        st.markdown("""
+        - The **neckline must be flat and horizontal**
+        - No upward or downward slope is allowed
+        - A flat line clearly shows **where the seller is sitting**
+        """)
+
+        st.subheader("🔗 The Three Connection Points")
+        st.markdown("""
+        The horizontal neckline must **perfectly touch**:
+        1. The start of the **Left Shoulder**
+        2. The peak **after the Head**
+        3. The start of the **Right Shoulder**
+        """)
+
+        st.divider()
+
+        # --------------------------------------------------
+        # Section 2
+        # --------------------------------------------------
+        st.subheader("💎 2. The Fundamental Filter")
+
+        st.markdown("""
+        We **never apply technical patterns to junk stocks**.
+        This strategy is applied **only** to companies that are:
+        """)
+
+        st.markdown("""
+        - 💼 **Financially stable businesses**
+        """)
+
+        st.info("""
+        📌 If the **business quality is weak**,  the chart pattern will eventually **fail**.
+            **Business first. Chart second.**   """)
+
+        st.divider()
+
+        # --------------------------------------------------
+        # Section 3
+        # --------------------------------------------------
+        st.subheader("🚀 3. The “Early” Entry Strategy")
+
+        st.markdown(""" Most traders wait for a **neckline breakout**.   We don’t. """)
+
+        st.markdown("""
+        ### What we look for instead:
+        - A **Base Formation** inside the **Right Shoulder**
+        - Small consolidation
+        - Followed by a **strong Green Candle 🕯️ (closing basis)**
+        """)
+
+        st.success("""
+        ✅ This gives:
+        - Better entry price  
+        - Smaller stop-loss  
+        - Higher risk-reward
+        """)
+
+        st.divider()
@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import request_queue  # noqa: E402
+
+# -----------------------------
+# TEST FIXTURES
+# Local stand-ins for the OpenAI API, isolated caches and a fresh request queue
+# -----------------------------
+
+
+def _chunk(delta=None, usage=None):
+    choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": None}]
+    return {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "test",
+            "choices": choices, "usage": usage}
+
+
+class FakeOpenAI:
+    """
+    OpenAI-compatible /chat/completions endpoint on localhost
+
+    mode: "answer" (reply with `answer`), "429" (always rate limited) or
+    "drop" (stream part of the answer, then cut the connection)
+    """
+
+    usage = {"prompt_tokens": 11, "completion_tokens": 7, "total_tokens": 18}
+
+    def __init__(self):
+        self.mode = "answer"
+        self.answer = "**Test Co - Current Price: ₹100**"
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                fake.requests.append(body)
+                if fake.mode == "429":
+                    self._json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}})
+                elif body.get("stream"):
+                    self._stream(drop=fake.mode == "drop")
+                else:
+                    self._json(200, {
+                        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": body["model"],
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": fake.answer},
+                                     "finish_reason": "stop"}],
+                        "usage": fake.usage,
+                    })
+
+            def _json(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _stream(self, drop):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = fake.answer.split(" ")
+                if drop:
+                    words = words[:max(1, len(words) // 2)]
+                for i, word in enumerate(words):
+                    text = word if i == 0 else " " + word
+                    self._send_chunk(f"data: {json.dumps(_chunk({'content': text}))}\n\n".encode())
+                if drop:
+                    # No terminating chunk: the client sees an incomplete body
+                    self.close_connection = True
+                    return
+                self._send_chunk(f"data: {json.dumps(_chunk(usage=fake.usage))}\n\n".encode())
+                self._send_chunk(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_openai():
+    server = FakeOpenAI()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Fresh process-wide request queue with near-zero backoff"""
+    monkeypatch.setattr(request_queue, "_queue", None)
+    monkeypatch.setattr(request_queue, "BACKOFF_BASE", 0.01)
+    return request_queue.get_queue()
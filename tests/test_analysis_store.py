@@ -0,0 +1,44 @@
+import analysis_store
+import chat_context
+
+ANSWER = """**Reliance Industries - Current Price: ₹2,400**
+
+| 📊 VALUATION | ⭐ PROFITABILITY | 📈 GROWTH | 💼 BALANCE SHEET |
+|--------------|------------------|-----------|------------------|
+| **P/E Ratio** = 21.05 | **ROE** = 12% | **EPS Growth** = 10% | **Debt/Equity** = 0.5 |
+
+| Parameter | Details |
+|-----------|---------|
+| **Call** | **HOLD** |
+| **Entry Zone** | ₹2,200 - ₹2,300 |
+| **Target (12M)** | ₹2,700 |
+| **Stop Loss** | ₹2,100 |
+| **Risk-Reward** | 1:2.5 |
+"""
+
+
+def test_parse_analysis():
+    record = analysis_store.parse_analysis(ANSWER)
+    assert record["company"] == "Reliance Industries"
+    assert (record["price"], record["pe"], record["roe"], record["debt_equity"]) == (2400.0, 21.05, 12.0, 0.5)
+    assert (record["entry_low"], record["entry_high"], record["target"], record["stop_loss"]) == (2200.0, 2300.0, 2700.0, 2100.0)
+    assert record["call"] == "HOLD" and record["risk_reward"] == 2.5
+    assert analysis_store.parse_analysis("No tables here") is None
+
+
+def test_follow_up_filed_under_company_not_question(tmp_path):
+    store = analysis_store.AnalysisStore(str(tmp_path / "analyses.sqlite3"))
+    assert store.save(ANSWER, "Why?", "gpt-4o-mini")["ticker"] == "RELIANCE INDUSTRIES"
+    assert store.save(ANSWER, "Analyze RELIANCE", "gpt-4o-mini", ticker="RELIANCE")["ticker"] == "RELIANCE"
+    assert store.tickers() == ["RELIANCE", "RELIANCE INDUSTRIES"]
+
+
+def test_subject_is_newest_named_stock():
+    history = [
+        {"role": "user", "content": "Analyze RELIANCE"},
+        {"role": "assistant", "content": ANSWER},
+        {"role": "user", "content": "Why?"},
+    ]
+    assert chat_context.subject(history) == "RELIANCE"
+    assert chat_context.subject(history + [{"role": "user", "content": "INFY vs TCS?"}]) == "INFY vs TCS"
+    assert chat_context.subject([{"role": "user", "content": "What about its stop loss?"}]) is None
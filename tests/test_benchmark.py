@@ -0,0 +1,32 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_synthetic_names_are_unique(seed):
+    rng = np.random.default_rng(seed)
+    assert len(set(benchmark._scripts(rng, benchmark.SCRIPT_COUNT))) == benchmark.SCRIPT_COUNT
+
+    trades = pd.read_csv(io.BytesIO(benchmark.synthetic_trades(3000, seed)), skiprows=2)
+    assert len(trades) == 3000 and trades["SCRIPT"].nunique() <= benchmark.SCRIPT_COUNT
+
+    live = pd.read_csv(io.BytesIO(benchmark.synthetic_live(300, seed)), skiprows=3).dropna(subset=["Strategy Name"])
+    assert live["Stock"].is_unique
+
+
+def test_benchmark_leaves_loader_cache_empty(monkeypatch):
+    import trade_data
+
+    monkeypatch.setattr(trade_data, "_cache", {})
+    server, base_url = benchmark.serve({"/trades.csv": benchmark.synthetic_trades(500), "/live.csv": benchmark.synthetic_live(50)})
+    try:
+        benchmark.bench_trades(base_url + "/trades.csv", 500, repeat=2)
+        benchmark.bench_live(base_url + "/live.csv", 50, repeat=2)
+    finally:
+        server.shutdown()
+    assert trade_data._cache == {}
@@ -0,0 +1,33 @@
+import chat_component
+
+
+def test_stream_yields_answer_and_usage(fake_openai, queue):
+    fake_openai.answer = "**TCS - Current Price: ₹4,000** steady deal wins"
+    usage = {}
+    chunks = list(chat_component.stream_stock_analysis(
+        "Analyze TCS", "test-key", "gpt-4o-mini", history=[], usage=usage, base_url=fake_openai.base_url,
+    ))
+    assert len(chunks) > 1
+    assert "".join(chunks) == fake_openai.answer
+    assert (usage["prompt_tokens"], usage["completion_tokens"]) == (11, 7)
+    assert usage["estimated_prompt_tokens"] > 0 and "error" not in usage
+
+    request = fake_openai.requests[-1]
+    assert request["stream"] is True and request["stream_options"] == {"include_usage": True}
+    assert request["messages"][0]["content"] == chat_component.SYSTEM_PROMPT
+
+
+def test_analyze_stock_without_streaming(fake_openai, queue):
+    usage = {}
+    response = chat_component.analyze_stock(
+        "Analyze TCS", "test-key", "gpt-4o-mini", history=[], usage=usage, base_url=fake_openai.base_url,
+    )
+    assert response == fake_openai.answer
+    assert usage["prompt_tokens"] == 11
+
+
+def test_client_pooled_per_configuration(fake_openai):
+    client = chat_component.get_client("test-key", base_url=fake_openai.base_url)
+    assert chat_component.get_client("test-key", base_url=fake_openai.base_url) is client
+    assert chat_component.get_client("test-key", base_url=fake_openai.base_url, timeout=5) is not client
+    assert client.max_retries == 0
@@ -0,0 +1,35 @@
+import threading
+
+import pandas as pd
+
+import data_plane
+
+
+def test_publish_versions_are_unique(monkeypatch):
+    monkeypatch.setattr(data_plane, "_datasets", {})
+    frames = [pd.DataFrame({"a": range(1000)}) for _ in range(16)]
+    barrier = threading.Barrier(len(frames))
+    published = []
+
+    def publish(frame):
+        barrier.wait()
+        published.append(data_plane.publish("trades", frame).version)
+
+    threads = [threading.Thread(target=publish, args=(frame,)) for frame in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(published) == list(range(1, len(frames) + 1))
+
+
+def test_same_frame_keeps_version(monkeypatch):
+    monkeypatch.setattr(data_plane, "_datasets", {})
+    frame = pd.DataFrame({"a": [1, 2]})
+    first = data_plane.publish("live", frame)
+    assert data_plane.publish("live", frame) is first
+    assert data_plane.publish("live", frame.copy()).version == 2
+
+
+def test_import_leaves_pandas_options_alone():
+    assert pd.get_option("mode.copy_on_write") is False
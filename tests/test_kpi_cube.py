@@ -0,0 +1,116 @@
+import io
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import benchmark
+import chart_data
+import equity_analytics
+import filter_index
+import kpi_cube
+import schema
+
+# The Dashboard computations as main.py did them before the cube: boolean masks,
+# then sum/max/min, value_counts and groupby on the filtered frame
+
+
+def _trades():
+    raw = pd.read_csv(io.BytesIO(benchmark.synthetic_trades(3000, seed=7)), skiprows=2, usecols=list(schema.TRADE_SCHEMA))
+    frame = schema.normalize_trades(raw)
+    rng = np.random.default_rng(7)
+    for col in ["PLATFORM", "EXIT DATE", "PROFIT/ABS", "PROFIT/%", "SCRIPT", "STRATEGY"]:
+        frame.loc[rng.choice(len(frame), size=40, replace=False), col] = np.nan
+    return frame
+
+
+@pytest.fixture(scope="module")
+def trades():
+    return _trades()
+
+
+def _selections(frame):
+    platforms = [kpi_cube.ALL] + frame["PLATFORM"].dropna().unique().tolist() + ["Unknown"]
+    strategies = [kpi_cube.ALL] + frame["STRATEGY"].dropna().unique().tolist()
+    return list(itertools.product(platforms, strategies))
+
+
+def _mask(frame, platform, strategy):
+    filtered = frame
+    if platform != kpi_cube.ALL:
+        filtered = filtered[filtered["PLATFORM"] == platform]
+    if strategy != kpi_cube.ALL:
+        filtered = filtered[filtered["STRATEGY"] == strategy]
+    return filtered
+
+
+def _counts(column):
+    return column.astype(object).value_counts().to_dict()
+
+
+def _monthly(filtered):
+    monthly = filtered.dropna(subset=["EXIT DATE"]).copy()
+    monthly["Month"] = monthly["EXIT DATE"].dt.to_period("M").astype(str)
+    return monthly.groupby("Month")["PROFIT/ABS"].sum().sort_index()
+
+
+def _stockwise(filtered):
+    return (
+        filtered.assign(SCRIPT=filtered["SCRIPT"].astype(object))
+        .groupby("SCRIPT", as_index=False)
+        .agg(TOTAL_PROFIT_ABS=("PROFIT/ABS", "sum"), AVG_PROFIT_PCT=("PROFIT/%", "mean"))
+        .sort_values("SCRIPT", ignore_index=True)
+    )
+
+
+def test_cube_matches_pandas(trades):
+    cube = kpi_cube.build_cube(trades)
+    for platform, strategy in _selections(trades):
+        filtered = _mask(trades, platform, strategy)
+        kpis = cube.kpis(platform, strategy)
+
+        assert kpis["trades"] == len(filtered)
+        assert kpis["total_turnover"] == pytest.approx(filtered["INVESTED"].sum())
+        assert kpis["total_profit"] == pytest.approx(filtered["PROFIT/ABS"].sum())
+        np.testing.assert_allclose(kpis["max_trade"], filtered["PROFIT/ABS"].max())
+        np.testing.assert_allclose(kpis["min_trade"], filtered["PROFIT/ABS"].min())
+
+        assert cube.strategy_counts(platform, strategy).to_dict() == _counts(filtered["STRATEGY"])
+        assert cube.platform_counts(platform, strategy).to_dict() == _counts(filtered["PLATFORM"])
+
+        monthly = cube.monthly_profit(platform, strategy)["PROFIT/ABS"]
+        expected = _monthly(filtered)
+        assert monthly.index.tolist() == expected.index.tolist()
+        np.testing.assert_allclose(monthly.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+        pd.testing.assert_frame_equal(
+            cube.stockwise(platform, strategy), _stockwise(filtered), check_dtype=False, check_index_type=False,
+        )
+
+
+def test_filter_index_matches_masks(trades):
+    index = filter_index.FilterIndex(trades, kpi_cube.DIMENSIONS)
+    for platform, strategy in _selections(trades):
+        positions = index.select({"PLATFORM": platform, "STRATEGY": strategy})
+        expected = trades.index.get_indexer(_mask(trades, platform, strategy).index)
+        np.testing.assert_array_equal(positions, expected)
+        pd.testing.assert_frame_equal(filter_index.take(trades, positions), _mask(trades, platform, strategy))
+        assert index.counts("STRATEGY", positions).to_dict() == _counts(trades["STRATEGY"].iloc[positions])
+
+
+def test_multi_select(trades):
+    index = filter_index.FilterIndex(trades, kpi_cube.DIMENSIONS)
+    platforms = trades["PLATFORM"].dropna().unique().tolist()[:2]
+    positions = index.select({"PLATFORM": platforms, "STRATEGY": kpi_cube.ALL})
+    expected = np.flatnonzero(trades["PLATFORM"].isin(platforms).to_numpy())
+    np.testing.assert_array_equal(positions, expected)
+
+
+def test_dashboard_charts_include_rolling_win(trades):
+    cube = kpi_cube.build_cube(trades)
+    equity = equity_analytics.compute(trades, 1_000_000)
+    charts = chart_data.dashboard_charts(trades, cube, equity, kpi_cube.ALL, kpi_cube.ALL)
+    rolling_win = charts["rolling_win"]["Rolling Win %"]
+    assert len(rolling_win) == min(len(equity["curve"]), chart_data.DEFAULT_POINTS)
+    pd.testing.assert_series_equal(rolling_win, equity["curve"]["Rolling Win %"].loc[rolling_win.index])
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import live_refresh
+
+
+def _live(rows):
+    return pd.DataFrame(rows, columns=["Stock", "Strategy Name", "Gain", "Current Value"])
+
+
+OLD = _live([
+    ["TCS", "RHS", 1.0, 100.0],
+    ["INFY", "Swing", np.nan, 200.0],
+    ["ITC", "RHS", 3.0, 300.0],
+    ["ITC", "RHS", 4.0, 400.0],
+])
+
+
+def test_no_change():
+    diff = live_refresh.diff_frames(OLD, OLD.copy())
+    assert diff["changed"].empty and diff["added"].empty and diff["removed"].empty
+
+
+def test_changed_cells_ignore_nan_to_nan():
+    new = OLD.copy()
+    new.loc[0, "Gain"] = 1.5
+    diff = live_refresh.diff_frames(OLD, new)
+    assert diff["changed"].to_dict("records") == [
+        {"Stock": "TCS", "Strategy Name": "RHS", "column": "Gain", "old": 1.0, "new": 1.5},
+    ]
+
+    new.loc[1, "Gain"] = 2.0
+    changed = live_refresh.diff_frames(OLD, new)["changed"]
+    assert changed[changed["Stock"] == "INFY"][["old", "new"]].to_numpy().tolist()[0][1] == 2.0
+
+
+def test_added_and_removed():
+    new = pd.concat([OLD.iloc[1:], _live([["HDFC", "Breakout", 0.5, 50.0]])], ignore_index=True)
+    diff = live_refresh.diff_frames(OLD, new)
+    assert diff["added"]["Stock"].tolist() == ["HDFC"]
+    assert diff["removed"]["Stock"].tolist() == ["TCS"]
+    assert diff["changed"].empty
+
+
+def test_duplicate_keys_matched_by_occurrence():
+    # Second ITC lot closed; the first one is unchanged
+    new = OLD.iloc[:3].copy()
+    diff = live_refresh.diff_frames(OLD, new)
+    assert diff["changed"].empty
+    assert diff["removed"][["Stock", "Gain"]].to_numpy().tolist() == [["ITC", 4.0]]
+
+    # A third lot opened and the second moved
+    new = pd.concat([OLD, _live([["ITC", "RHS", 5.0, 500.0]])], ignore_index=True)
+    new.loc[3, "Gain"] = 4.5
+    diff = live_refresh.diff_frames(OLD, new)
+    assert diff["added"][["Stock", "Gain"]].to_numpy().tolist() == [["ITC", 5.0]]
+    assert diff["changed"][["Stock", "old", "new"]].to_numpy().tolist() == [["ITC", 4.0, 4.5]]
+
+
+def test_first_poll_has_everything_added():
+    diff = live_refresh.diff_frames(None, OLD)
+    assert diff["added"] is OLD and diff["removed"].empty and diff["changed"].empty
+
+
+def test_poller_stops_when_idle(monkeypatch):
+    loads = []
+    frames = [OLD, OLD.assign(Gain=OLD["Gain"] + 1)]
+    monkeypatch.setattr(live_refresh, "IDLE_POLLS", 3)
+    monkeypatch.setattr(live_refresh.trade_data, "load_live", lambda url, force=False: loads.append(1) or frames[min(len(loads), 2) - 1])
+
+    poller = live_refresh.LivePoller("http://sheet.invalid/live.csv", interval=0.02)
+    version, frame, diff, _ = poller.latest()
+    assert frame is not None and version >= 1
+
+    deadline = time.monotonic() + 5
+    while poller._thread is not None:
+        assert time.monotonic() < deadline, "poller kept running without readers"
+        time.sleep(0.01)
+    stopped_at = len(loads)
+    time.sleep(0.1)
+    assert len(loads) == stopped_at
+
+    # Changed data produced a diff and a new version
+    assert poller.frame is frames[1] and poller.version >= 2
+    assert poller.diff is not None
+
+    # A new reader restarts it
+    poller.latest()
+    assert poller._thread is not None
@@ -0,0 +1,88 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import batch_analysis
+import chat_component
+import request_queue
+
+
+def test_concurrency_cap(queue):
+    queue.concurrency = 2
+    queue.model_rpm = 6000
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def call():
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: queue.submit(call, model="m"), range(8)))
+    assert results == ["ok"] * 8
+    assert running["peak"] == 2
+    assert queue.stats()["completed"] == 8
+
+
+def test_retries_transient_errors(queue):
+    class Transient(Exception):
+        status_code = 429
+
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Transient("rate limited")
+        return "ok"
+
+    assert queue.submit(call, model="m") == "ok"
+    assert len(attempts) == 3
+    assert queue.stats()["retries"] == 2
+
+
+def test_rejects_when_wait_too_long(queue):
+    queue.max_wait = 1.0
+    queue.user_rpm = 1
+    bucket = queue._bucket(("user", "alice"), 1, request_queue.DEFAULT_USER_BURST)
+    for _ in range(request_queue.DEFAULT_USER_BURST):
+        bucket.reserve()
+    with pytest.raises(request_queue.RateLimited):
+        queue.submit(lambda: "ok", user="alice", model="m")
+    assert queue.stats()["rejected"] == 1
+
+
+def test_one_retry_layer_against_rate_limited_api(fake_openai, queue):
+    fake_openai.mode = "429"
+    usage = {}
+    response = chat_component.analyze_stock(
+        "Analyze TCS", "test-key", "gpt-4o-mini", history=[], usage=usage, base_url=fake_openai.base_url,
+    )
+    assert "error" in usage and response.startswith("❌ Error")
+    assert len(fake_openai.requests) == request_queue.MAX_ATTEMPTS
+
+
+def test_batch_uses_per_user_bucket(fake_openai, queue):
+    fake_openai.answer = "Test answer"
+    results = batch_analysis.analyze_batch(["TCS", "INFY"], "test-key", user="alice", base_url=fake_openai.base_url)
+    assert [row["Error"] for row in results] == [None, None]
+    assert ("user", "alice") in queue._buckets
+    assert len(fake_openai.requests) == 2
+
+
+def test_max_attempts_configurable(fake_openai, queue):
+    request_queue.get_queue(max_attempts=2)
+    fake_openai.mode = "429"
+    usage = {}
+    chat_component.analyze_stock(
+        "Analyze TCS", "test-key", "gpt-4o-mini", history=[], usage=usage, base_url=fake_openai.base_url,
+    )
+    assert "error" in usage
+    assert len(fake_openai.requests) == 2
@@ -0,0 +1,140 @@
+import chat_component
+import chat_context
+import response_cache
+from chat_component import SYSTEM_PROMPT
+
+
+def test_normalize_question():
+    assert response_cache.normalize_question("Should I buy TCS at current price?") == (("TCS",), "trade")
+    assert response_cache.normalize_question("INFY vs TCS which is better?") == (("INFY", "TCS"), "compare")
+    assert response_cache.normalize_question("Is HDFC Bank overvalued?") == (("HDFC BANK",), "valuation")
+
+
+def test_follow_ups_name_no_ticker():
+    assert response_cache.normalize_question("Why?") is None
+    assert response_cache.normalize_question("What about its stop loss?") is None
+    assert response_cache.make_key("Why?", "gpt-4o-mini", SYSTEM_PROMPT) is None
+
+
+def test_key_depends_on_prior_turns():
+    question = "Should I buy TCS?"
+
+    def key(history):
+        context = chat_context.prior_context(SYSTEM_PROMPT, history + [{"role": "user", "content": question}], question)
+        return response_cache.make_key(question, "gpt-4o-mini", SYSTEM_PROMPT, context)
+
+    fresh = key([])
+    assert fresh == response_cache.make_key(question, "gpt-4o-mini", SYSTEM_PROMPT)
+    after_reliance = key([{"role": "user", "content": "Analyze RELIANCE"}, {"role": "assistant", "content": "Reliance answer"}])
+    after_infy = key([{"role": "user", "content": "Analyze INFY"}, {"role": "assistant", "content": "Infosys answer"}])
+    assert len({fresh, after_reliance, after_infy}) == 3
+
+
+def test_cache_ttl_and_lru(tmp_path):
+    cache = response_cache.ResponseCache(str(tmp_path / "responses.sqlite3"), ttl=60, max_entries=2)
+    for key in "abc":
+        cache.put(key, f"answer {key}")
+    assert cache.get("a") is None
+    assert cache.get("c") == "answer c"
+
+    cache.ttl = 0
+    assert cache.get("c") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_dropped_stream_reports_error_outside_text(fake_openai, queue):
+    fake_openai.mode = "drop"
+    fake_openai.answer = "one two three four five six"
+    usage = {}
+    chunks = list(chat_component.stream_stock_analysis(
+        "Analyze TCS", "test-key", "gpt-4o-mini", history=[], usage=usage, base_url=fake_openai.base_url,
+    ))
+    assert "".join(chunks) == "one two three"
+    assert "error" in usage
+    assert not any("Error" in chunk for chunk in chunks)
+
+
+def _chat_app(base_url):
+    from chat_component import render_stock_chat
+
+    render_stock_chat("test-key", "gpt-4o-mini", stream=False, base_url=base_url)
+
+
+def _ask(app, question):
+    app.chat_input[0].set_value(question).run(timeout=30)
+
+
+def test_follow_up_not_served_from_another_session(fake_openai, queue, tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(response_cache, "_caches", {})
+    monkeypatch.setattr(chat_component.analysis_store, "_stores", {})
+
+    first = AppTest.from_function(_chat_app, args=(fake_openai.base_url,))
+    first.run(timeout=30)
+    fake_openai.answer = "RELIANCE answer"
+    _ask(first, "Analyze RELIANCE")
+    fake_openai.answer = "Because of RELIANCE margins"
+    _ask(first, "Why?")
+
+    second = AppTest.from_function(_chat_app, args=(fake_openai.base_url,))
+    second.run(timeout=30)
+    fake_openai.answer = "TCS answer"
+    _ask(second, "Analyze TCS")
+    fake_openai.answer = "Because of TCS deal wins"
+    _ask(second, "Why?")
+    assert second.session_state.messages[-1]["content"] == "Because of TCS deal wins"
+    assert len(fake_openai.requests) == 4
+
+    third = AppTest.from_function(_chat_app, args=(fake_openai.base_url,))
+    third.run(timeout=30)
+    _ask(third, "Analyze RELIANCE")
+    assert third.session_state.messages[-1]["content"] == "RELIANCE answer"
+    assert len(fake_openai.requests) == 4
+
+
+def _streaming_chat_app(base_url):
+    from chat_component import render_stock_chat
+
+    render_stock_chat("test-key", "gpt-4o-mini", stream=True, base_url=base_url)
+
+
+def test_failed_stream_is_not_cached(fake_openai, queue, tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(response_cache, "_caches", {})
+    monkeypatch.setattr(chat_component.analysis_store, "_stores", {})
+
+    fake_openai.mode = "drop"
+    fake_openai.answer = "partial RELIANCE answer cut short"
+    app = AppTest.from_function(_streaming_chat_app, args=(fake_openai.base_url,))
+    app.run(timeout=30)
+    _ask(app, "Analyze RELIANCE")
+    assert "❌ Error" in app.session_state.messages[-1]["content"]
+    assert response_cache.get_cache().stats()["entries"] == 0
+    assert chat_component.analysis_store.get_store().tickers() == []
+
+
+def test_get_cache_leaves_shared_settings_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "_caches", {})
+    path = str(tmp_path / "responses.sqlite3")
+    cache = response_cache.get_cache(path)
+    cache.put("k", "answer")
+    assert response_cache.get_cache(path) is cache and cache.ttl == response_cache.DEFAULT_TTL
+
+    # Each caller's freshness applies to its own lookups only
+    assert cache.get("k", ttl=0) is None
+    assert cache.get("k", ttl=60) == "answer"
+
+
+def test_batch_uses_configured_ttl(fake_openai, queue, tmp_path):
+    import batch_analysis
+
+    cache = response_cache.ResponseCache(str(tmp_path / "responses.sqlite3"))
+    fake_openai.answer = "TCS answer"
+    batch_analysis.analyze_batch(["TCS"], "test-key", cache=cache, cache_ttl=60, base_url=fake_openai.base_url)
+    assert batch_analysis.analyze_batch(["TCS"], "test-key", cache=cache, cache_ttl=60, base_url=fake_openai.base_url)[0]["Cached"]
+    assert not batch_analysis.analyze_batch(["TCS"], "test-key", cache=cache, cache_ttl=0, base_url=fake_openai.base_url)[0]["Cached"]
+    assert len(fake_openai.requests) == 2
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import scenarios
+
+
+def _live(caps):
+    n = len(caps)
+    return pd.DataFrame({
+        "Stock": [f"S{i}" for i in range(n)],
+        "Market Cap": pd.Categorical(caps),
+        "Current Value": np.full(n, 110.0),
+        "Invested Value": np.full(n, 100.0),
+        "Potential Gain": np.full(n, 10.0),
+    })
+
+
+def test_uniform_moves():
+    table = scenarios.evaluate(_live(["Large Cap", "Mid Cap"]), "uniform", (-10, 0, 10), capital=1000)["table"]
+    np.testing.assert_allclose(table["Unrealised P&L"], [-2.0, 20.0, 42.0])
+
+
+def test_market_cap_grid_limit():
+    live = _live(["Large Cap", "Mid Cap", "Small Cap", "Micro Cap", None])
+    with pytest.raises(ValueError):
+        scenarios.evaluate(live, "market_cap", scenarios.DEFAULT_MOVES)
+    result = scenarios.evaluate(live, "market_cap", (-10, 0, 10))
+    assert result["buckets"][-1] == scenarios.OTHER
+    assert result["surface"].shape == (3,) * 5
+    assert result["surface"][(1,) * 5] == pytest.approx(50.0)
@@ -0,0 +1,105 @@
+import io
+
+import pandas as pd
+import pytest
+
+import schema
+import sheet_region
+import trade_data
+
+COLUMNS = list(schema.LIVE_SCHEMA)
+
+
+def _row(stock, invested):
+    return [stock, "RHS", "Large Cap", "Zerodha", "2.5%", "₹1,025.00", f"₹{invested:,.2f}", "₹1,200.00", "17.07%", "14.57%"]
+
+
+def _csv(rows):
+    out = io.StringIO()
+    for row in rows:
+        out.write(",".join(f'"{cell}"' if "," in cell else cell for cell in row) + "\n")
+    return out.getvalue().encode("utf-8")
+
+
+def real_layout(above=25, preamble=25, positions=23, total_gap=False):
+    """
+    Mirrors the live sheet: a summary block, the header on line 25, rows
+    that look like data (an allocation table using the same columns), the
+    positions, and a Total row right under them
+    """
+    rows = [["Portfolio Summary", "", ""], ["Capital", "₹9,00,000", ""]]
+    rows += [["", "", ""] if i % 3 else [f"Note {i}", "", ""] for i in range(above - len(rows))]
+    rows.append(COLUMNS)
+    rows += [_row(f"ALLOC{i}", 1000 + i) for i in range(preamble)]
+    rows += [_row(f"POS{i}", 2000 + i) for i in range(positions)]
+    if total_gap:
+        rows.append([""] * len(COLUMNS))
+    rows.append(["Total", "", "", "", "", "", "₹99,999.00", "", "", ""])
+    return _csv(rows)
+
+
+def _baseline(body):
+    """The loader before region detection"""
+    frame = pd.read_csv(io.BytesIO(body), skip_blank_lines=True, skiprows=25, usecols=COLUMNS)
+    return frame.iloc[25:48]
+
+
+def _read(body, region=None):
+    return sheet_region.read_region(
+        body, COLUMNS, key_column="Stock", numeric_column="Invested Value", region=region,
+        skip=trade_data.LIVE_SKIP_ROWS, limit=trade_data.LIVE_MAX_ROWS,
+    )
+
+
+@pytest.mark.parametrize("total_gap", [False, True])
+def test_matches_baseline_slice(total_gap):
+    body = real_layout(total_gap=total_gap)
+    frame, region = _read(body)
+    assert frame["Stock"].tolist() == _baseline(body)["Stock"].tolist() == [f"POS{i}" for i in range(23)]
+    assert region == {"header": 25, "start": 51, "stop": 74}
+
+
+def test_blank_lines_not_counted_like_read_csv():
+    body = real_layout()
+    lines = body.split(b"\n")
+    body = b"\n".join(lines[:30] + [b"", b""] + lines[30:])
+    frame, _ = _read(body)
+    assert frame["Stock"].tolist() == _baseline(body)["Stock"].tolist()
+
+
+def test_fewer_positions_stop_at_total():
+    frame, _ = _read(real_layout(positions=20, total_gap=True))
+    assert frame["Stock"].tolist() == [f"POS{i}" for i in range(20)]
+
+
+def test_cached_region_fast_path(monkeypatch):
+    body = real_layout()
+    frame, region = _read(body)
+
+    # A region that still fits is returned as-is
+    calls = []
+    original = sheet_region._from_region
+    monkeypatch.setattr(sheet_region, "_from_region", lambda *a: calls.append(1) or original(*a))
+    again, same = _read(body, region)
+    assert calls and same is region
+    pd.testing.assert_frame_equal(again, frame)
+
+
+@pytest.mark.parametrize("layout", [
+    {"above": 27},                      # rows added above the header
+    {"above": 22},                      # rows removed above the header
+    {"positions": 21, "total_gap": True},  # positions closed
+])
+def test_cached_region_falls_back_when_layout_moves(layout):
+    _, region = _read(real_layout())
+    body = real_layout(**layout)
+    frame, moved = _read(body, region)
+    assert moved != region
+    fresh, fresh_region = _read(body)
+    pd.testing.assert_frame_equal(frame, fresh)
+    assert moved == fresh_region
+
+
+def test_missing_header():
+    with pytest.raises(ValueError):
+        _read(b"a,b,c\n1,2,3\n")
@@ -0,0 +1,101 @@
+import io
+import time
+
+import pandas as pd
+import pytest
+
+import benchmark
+import schema
+import snapshot_store
+
+TRADE_DTYPES = schema.dtypes(schema.TRADE_SCHEMA)
+
+
+def _trades(rows, seed=0):
+    raw = pd.read_csv(io.BytesIO(benchmark.synthetic_trades(rows, seed)), skiprows=2, usecols=list(schema.TRADE_SCHEMA))
+    return schema.normalize_trades(raw)
+
+
+@pytest.fixture(scope="module")
+def history():
+    return _trades(300)
+
+
+def _meta(root):
+    return snapshot_store._read_meta("trades", str(root))
+
+
+def test_append_writes_only_new_rows(tmp_path, history):
+    assert snapshot_store.sync("trades", history.iloc[:200], str(tmp_path)) == 200
+    assert snapshot_store.sync("trades", history.iloc[:200], str(tmp_path)) == 0
+    assert snapshot_store.sync("trades", history, str(tmp_path)) == 100
+    assert _meta(tmp_path)["parts"] == 2
+
+    snapshot = snapshot_store.read_snapshot("trades", str(tmp_path), TRADE_DTYPES)
+    pd.testing.assert_frame_equal(snapshot, history.reset_index(drop=True), check_categorical=False)
+    assert snapshot.dtypes.astype(str).to_dict() == TRADE_DTYPES
+
+
+def test_edit_to_persisted_rows_rewrites(tmp_path, history):
+    snapshot_store.sync("trades", history.iloc[:200], str(tmp_path))
+    edited = history.copy()
+    edited.loc[5, "PROFIT/ABS"] = 1.0
+    assert snapshot_store.sync("trades", edited, str(tmp_path)) == 300
+    assert _meta(tmp_path)["parts"] == 1
+    assert snapshot_store.read_snapshot("trades", str(tmp_path))["PROFIT/ABS"][5] == 1.0
+
+
+def test_compacts_at_max_parts(tmp_path, history, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "MAX_PARTS", 3)
+    for rows in (100, 150, 200):
+        snapshot_store.sync("trades", history.iloc[:rows], str(tmp_path))
+    assert _meta(tmp_path)["parts"] == 3
+    assert snapshot_store.sync("trades", history, str(tmp_path)) == 300
+    assert _meta(tmp_path)["parts"] == 1
+    assert len(list((tmp_path / "trades").glob("part-*.parquet"))) == 1
+
+
+def test_untyped_snapshot_is_ignored(tmp_path, history):
+    untyped = history.astype(object)
+    snapshot_store.sync("trades", untyped, str(tmp_path))
+    assert snapshot_store.read_snapshot("trades", str(tmp_path)) is not None
+    assert snapshot_store.read_snapshot("trades", str(tmp_path), TRADE_DTYPES) is None
+
+    # The typed frame replaces it instead of being appended to it
+    assert snapshot_store.sync("trades", history, str(tmp_path)) == 300
+    assert snapshot_store.read_snapshot("trades", str(tmp_path), TRADE_DTYPES) is not None
+
+
+def _wait_reconciled(name):
+    deadline = time.monotonic() + 10
+    while not snapshot_store.status(name)["reconciled"]:
+        assert time.monotonic() < deadline, snapshot_store.status(name)
+        time.sleep(0.01)
+
+
+def test_serve_snapshot_then_reconcile(tmp_path, history, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "_state", {})
+    snapshot_store.sync("trades", history.iloc[:200], str(tmp_path))
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return history
+
+    cold = snapshot_store.serve("trades", fetch, str(tmp_path), TRADE_DTYPES)
+    assert len(cold) == 200
+    _wait_reconciled("trades")
+    assert fetches
+
+    assert snapshot_store.serve("trades", fetch, str(tmp_path), TRADE_DTYPES) is history
+    assert _meta(tmp_path)["rows"] == 300 and _meta(tmp_path)["parts"] == 2
+
+
+def test_serve_skips_untyped_snapshot(tmp_path, history, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "_state", {})
+    snapshot_store.sync("trades", history.iloc[:200].astype(object), str(tmp_path))
+
+    served = snapshot_store.serve("trades", lambda: history, str(tmp_path), TRADE_DTYPES)
+    assert served is history
+    assert snapshot_store.status("trades")["reconciled"]
+    assert _meta(tmp_path)["dtypes"] == TRADE_DTYPES
@@ -0,0 +1,89 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import benchmark
+import trade_data
+
+
+class SheetServer:
+    """Local stand-in for the Google Sheets export, optionally sending an ETag"""
+
+    def __init__(self, body, etag=True):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+        sheet = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                sheet.requests.append(dict(self.headers))
+                tag = f'"{hash(sheet.body)}"'
+                if sheet.etag and self.headers.get("If-None-Match") == tag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if sheet.etag:
+                    self.send_header("ETag", tag)
+                self.send_header("Content-Length", str(len(sheet.body)))
+                self.end_headers()
+                self.wfile.write(sheet.body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/trades.csv"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def sheet(request):
+    server = SheetServer(benchmark.synthetic_trades(200), etag=getattr(request, "param", True))
+    yield server
+    server.close()
+
+
+def test_served_from_cache_within_ttl(sheet):
+    first = trade_data.load_trades(sheet.url, ttl=60)
+    assert trade_data.load_trades(sheet.url, ttl=60) is first
+    assert len(sheet.requests) == 1
+    assert len(first) == 200
+
+
+def test_revalidates_with_etag(sheet):
+    first = trade_data.load_trades(sheet.url, ttl=60)
+    again = trade_data.load_trades(sheet.url, ttl=60, force=True)
+    assert again is first
+    assert sheet.requests[-1].get("If-None-Match")
+
+    sheet.body = benchmark.synthetic_trades(250)
+    trade_data.refresh(sheet.url)
+    changed = trade_data.load_trades(sheet.url, ttl=60)
+    assert changed is not first and len(changed) == 250
+    assert len(sheet.requests) == 3
+
+
+@pytest.mark.parametrize("sheet", [False], indirect=True)
+def test_unchanged_body_not_reparsed_without_validators(sheet):
+    first = trade_data.load_trades(sheet.url, ttl=0)
+    assert trade_data.load_trades(sheet.url, ttl=0) is first
+    assert len(sheet.requests) == 2
+
+    sheet.body = benchmark.synthetic_trades(250)
+    assert len(trade_data.load_trades(sheet.url, ttl=0)) == 250
+
+
+def test_derived_built_once_per_frame(sheet):
+    frame = trade_data.load_trades(sheet.url, ttl=60)
+    builds = []
+    build = lambda f: builds.append(f) or len(f)  # noqa: E731
+    assert trade_data.derived(frame, "rows", build) == 200
+    assert trade_data.derived(frame, "rows", build) == 200
+    assert len(builds) == 1
@@ -0,0 +1,100 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# -----------------------------
+# HOT-PATH TIMING
+# Named spans around the expensive stages of a rerun, kept in a
+# process-wide ring buffer for p50/p95 and JSONL export
+# -----------------------------
+
+RECENT_SAMPLES = 200             # per span
+EXPORT_PATH = ".cache/timings.jsonl"
+
+_samples = {}
+_lock = threading.Lock()
+
+
+def record(name, ms, **tags):
+    """Add one measurement (milliseconds) for a span"""
+    sample = {"ts": time.time(), "span": name, "ms": ms, **tags}
+    with _lock:
+        buffer = _samples.get(name)
+        if buffer is None:
+            buffer = _samples[name] = deque(maxlen=RECENT_SAMPLES)
+        buffer.append(sample)
+
+
+@contextlib.contextmanager
+def span(name, **tags):
+    """
+    Time the enclosed block as `name`
+
+    Usage:
+        with timing.span("dashboard.table"):
+            st.dataframe(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000, **tags)
+
+
+def summary():
+    """
+    Per-span statistics over the recent samples
+
+    Returns:
+        DataFrame with Span, Count, p50 ms, p95 ms, Last ms (slowest p95 first)
+    """
+    with _lock:
+        durations = {name: [s["ms"] for s in buffer] for name, buffer in _samples.items()}
+    rows = [
+        {
+            "Span": name,
+            "Count": len(values),
+            "p50 ms": float(np.percentile(values, 50)),
+            "p95 ms": float(np.percentile(values, 95)),
+            "Last ms": values[-1],
+        }
+        for name, values in durations.items() if values
+    ]
+    table = pd.DataFrame(rows, columns=["Span", "Count", "p50 ms", "p95 ms", "Last ms"])
+    return table.sort_values("p95 ms", ascending=False, ignore_index=True)
+
+
+def export(path=EXPORT_PATH):
+    """
+    Append the recent samples to a JSONL file (one object per sample)
+
+    Returns:
+        Number of samples written
+    """
+    with _lock:
+        samples = sorted((s for buffer in _samples.values() for s in buffer), key=lambda s: s["ts"])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for sample in samples:
+            f.write(json.dumps(sample) + "\n")
+    return len(samples)
+
+
+def render_timing_panel():
+    """Sidebar panel (admins only) with p50/p95 per span and a JSONL export"""
+    with st.sidebar.expander("⏱️ Timings"):
+        st.dataframe(
+            summary(),
+            hide_index=True,
+            use_container_width=True,
+            column_config={col: st.column_config.NumberColumn(format="%.1f") for col in ["p50 ms", "p95 ms", "Last ms"]},
+        )
+        if st.button("Export JSONL", use_container_width=True):
+            st.caption(f"Wrote {export()} samples to {EXPORT_PATH}")
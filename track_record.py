@@ -0,0 +1,138 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# POSITION TRACK RECORD
+# Closed-trade stats per script and per (script, strategy), built once
+# per history load and joined onto live positions by hashed key
+# -----------------------------
+
+COLUMNS = ["Hist Trades", "Hist Win %", "Hist Avg %", "Hist Avg Days", "Hist Basis"]
+BY_STRATEGY = "Script + Strategy"
+BY_SCRIPT = "Script"
+
+_SEPARATOR = "\x1f"
+
+
+def _normalize(values):
+    """Keys compare case- and whitespace-insensitively ("tcs " == "TCS")"""
+    return pd.Series(values, dtype="object").fillna("").astype(str).str.strip().str.upper().to_numpy(dtype=object)
+
+
+def _hash(values):
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _normalized_codes(column):
+    """Category codes remapped onto normalized labels (-1 for missing/blank)"""
+    labels = _normalize(column.cat.categories)
+    unique, inverse = np.unique(labels, return_inverse=True)
+    codes = column.cat.codes.to_numpy()
+    mapped = np.where(codes >= 0, inverse[np.maximum(codes, 0)], -1)
+    blank = np.flatnonzero(unique == "")
+    if len(blank):
+        mapped[mapped == blank[0]] = -1
+    return mapped, unique
+
+
+def _group_stats(groups, size, pnl, pct, days):
+    """Trades, win %, mean PROFIT/% and mean holding days per group id"""
+    def mean(values):
+        valid = ~np.isnan(values)
+        total = np.bincount(groups[valid], weights=values[valid], minlength=size)
+        count = np.bincount(groups[valid], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count
+
+    trades = np.bincount(groups, minlength=size)
+    wins = np.bincount(groups, weights=(pnl > 0), minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = wins / trades * 100
+    return pd.DataFrame({
+        "Hist Trades": trades,
+        "Hist Win %": win_rate,
+        "Hist Avg %": mean(pct),
+        "Hist Avg Days": mean(days),
+    })
+
+
+class TrackRecord:
+    """Closed-trade stats keyed by hashed script and (script, strategy)"""
+
+    def __init__(self, trades):
+        closed = trades["PROFIT/ABS"].notna().to_numpy()
+        scripts, script_labels = _normalized_codes(trades["SCRIPT"])
+        strategies, strategy_labels = _normalized_codes(trades["STRATEGY"])
+        pnl = trades["PROFIT/ABS"].to_numpy(dtype="float64")
+        pct = trades["PROFIT/%"].to_numpy(dtype="float64")
+        days = (trades["EXIT DATE"] - trades["ENTRY DATE"]).dt.days.to_numpy(dtype="float64")
+
+        valid = closed & (scripts >= 0)
+        scripts, strategies, pnl, pct, days = scripts[valid], strategies[valid], pnl[valid], pct[valid], days[valid]
+
+        # Per script
+        self._scripts = _group_stats(scripts, len(script_labels), pnl, pct, days)
+        self._script_keys = pd.Index(_hash(script_labels))
+
+        # Per (script, strategy)
+        has_strategy = strategies >= 0
+        pair_ids = scripts[has_strategy].astype(np.int64) * len(strategy_labels) + strategies[has_strategy]
+        pairs, groups = np.unique(pair_ids, return_inverse=True)
+        self._pairs = _group_stats(groups, len(pairs), pnl[has_strategy], pct[has_strategy], days[has_strategy])
+        pair_labels = script_labels[pairs // len(strategy_labels)] + _SEPARATOR + strategy_labels[pairs % len(strategy_labels)]
+        self._pair_keys = pd.Index(_hash(pair_labels))
+
+        self._joined = None
+
+    def lookup(self, stocks, strategies):
+        """
+        Stats for each (stock, strategy); falls back to the script's overall
+        record when that strategy has no history for it
+
+        Returns:
+            DataFrame with COLUMNS, one row per input (NaN when no history)
+        """
+        stocks, strategies = _normalize(stocks), _normalize(strategies)
+        pair_rows = self._pair_keys.get_indexer(_hash(stocks + _SEPARATOR + strategies))
+        script_rows = self._script_keys.get_indexer(_hash(stocks))
+
+        stats_columns = COLUMNS[:-1]
+        pairs = self._pairs.reindex(pair_rows)[stats_columns].to_numpy()
+        scripts = self._scripts.reindex(script_rows)[stats_columns].to_numpy()
+        by_pair = pair_rows >= 0
+        result = pd.DataFrame(np.where(by_pair[:, None], pairs, scripts), columns=stats_columns)
+        result["Hist Basis"] = np.where(by_pair, BY_STRATEGY, np.where(script_rows >= 0, BY_SCRIPT, None))
+        return result
+
+    def join(self, live):
+        """
+        Live frame with the track record columns appended (memoized per live frame)
+
+        Args:
+            live: Frame normalized with schema.LIVE_SCHEMA
+
+        Returns:
+            New DataFrame: live columns + COLUMNS
+        """
+        if self._joined is not None and self._joined[0]() is live:
+            return self._joined[1]
+        stats = self.lookup(live["Stock"], live["Strategy Name"].astype(object))
+        joined = pd.concat([live.reset_index(drop=True), stats], axis=1)
+        joined.index = live.index
+        self._joined = (weakref.ref(live), joined)
+        return joined
+
+
+def build_track_record(trades):
+    """
+    Build the track record for a typed trade-history frame
+
+    Args:
+        trades: DataFrame normalized with schema.TRADE_SCHEMA
+
+    Returns:
+        TrackRecord
+    """
+    return TrackRecord(trades)
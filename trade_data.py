@@ -0,0 +1,258 @@
+import hashlib
+import io
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+
+import pandas as pd
+
+import schema
+import sheet_region
+import timing
+
+# -----------------------------
+# SHARED TRADE DATA LOADER
+# Process-wide cache for the Google Sheets CSV exports
+# -----------------------------
+
+DEFAULT_TTL = 300  # seconds before a cached sheet is revalidated
+# Live sheet layout: the positions follow 25 rows under the header, 23 rows at most
+LIVE_SKIP_ROWS = 25
+LIVE_MAX_ROWS = 23
+REQUEST_TIMEOUT = 30
+
+_cache = {}
+_derived = {}
+_live_regions = {}
+_lock = threading.Lock()
+
+
+class _CacheEntry:
+    """One cached download: parsed frame plus the validators to revalidate it"""
+
+    def __init__(self, frame, etag, last_modified, digest):
+        self.frame = frame
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.fetched_at = time.monotonic()
+        self.lock = threading.Lock()
+
+
+def _fetch(url, entry=None):
+    """
+    Download a URL, sending conditional headers when we already hold a copy
+
+    Args:
+        url: Address of the CSV export
+        entry: Existing cache entry (optional)
+
+    Returns:
+        (body, etag, last_modified) or None when the server answered 304
+    """
+    request = urllib.request.Request(url)
+    if entry is not None:
+        if entry.etag:
+            request.add_header("If-None-Match", entry.etag)
+        if entry.last_modified:
+            request.add_header("If-Modified-Since", entry.last_modified)
+
+    try:
+        with timing.span("sheet.fetch"), urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            body = response.read()
+            return body, response.headers.get("ETag"), response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry is not None:
+            return None
+        raise
+
+
+def load(url, parse, key=None, ttl=DEFAULT_TTL, force=False):
+    """
+    Return the parsed contents of a URL from the process-wide cache
+
+    Within the TTL the cached frame is returned without touching the network.
+    After it, the URL is revalidated with ETag/Last-Modified; when the server
+    sends neither, the body is hashed and only re-parsed if the hash changed.
+
+    Args:
+        url: Address of the CSV export
+        parse: Callable turning the raw body (bytes) into a DataFrame
+        key: Extra cache key component (e.g. the column selection)
+        ttl: Seconds a cached frame is served without revalidation
+        force: Revalidate now regardless of the TTL
+
+    Returns:
+        The parsed DataFrame (shared - do not modify in place)
+    """
+    cache_key = (url, key)
+    with _lock:
+        entry = _cache.get(cache_key)
+
+    if entry is not None and not force and time.monotonic() - entry.fetched_at < ttl:
+        return entry.frame
+
+    if entry is None:
+        body, etag, last_modified = _fetch(url)
+        new_entry = _CacheEntry(parse(body), etag, last_modified, hashlib.sha256(body).hexdigest())
+        with _lock:
+            _cache[cache_key] = new_entry
+        return new_entry.frame
+
+    # One revalidation per entry at a time; other sessions keep the old frame
+    with entry.lock:
+        if not force and time.monotonic() - entry.fetched_at < ttl:
+            return entry.frame
+
+        result = _fetch(url, entry)
+        if result is not None:
+            body, etag, last_modified = result
+            digest = hashlib.sha256(body).hexdigest()
+            if digest != entry.digest:
+                entry.frame = parse(body)
+                entry.digest = digest
+            entry.etag = etag
+            entry.last_modified = last_modified
+        entry.fetched_at = time.monotonic()
+        return entry.frame
+
+
+def load_csv(url, usecols=None, ttl=DEFAULT_TTL, force=False, **read_csv_kwargs):
+    """
+    Cached pd.read_csv for a remote CSV
+
+    Args:
+        url: Address of the CSV export
+        usecols: Columns to keep (part of the cache key)
+        ttl: Seconds a cached frame is served without revalidation
+        force: Revalidate now regardless of the TTL
+        **read_csv_kwargs: Passed through to pd.read_csv
+
+    Returns:
+        The parsed DataFrame (shared - do not modify in place)
+    """
+    columns = tuple(usecols) if usecols is not None else None
+    key = (columns, tuple(sorted(read_csv_kwargs.items())))
+
+    def parse(body):
+        return pd.read_csv(io.BytesIO(body), usecols=usecols, **read_csv_kwargs)
+
+    return load(url, parse, key=key, ttl=ttl, force=force)
+
+
+def load_trades(url, ttl=DEFAULT_TTL, force=False):
+    """
+    Cached, typed trade-history sheet (closed trades)
+
+    Args:
+        url: Address of the trade-history CSV export
+        ttl: Seconds a cached frame is served without revalidation
+        force: Revalidate now regardless of the TTL
+
+    Returns:
+        DataFrame normalized with schema.TRADE_SCHEMA
+    """
+    def parse(body):
+        with timing.span("trades.read_csv"):
+            frame = pd.read_csv(io.BytesIO(body), skip_blank_lines=True, skiprows=2, usecols=list(schema.TRADE_SCHEMA))
+        with timing.span("trades.normalize"):
+            return schema.normalize_trades(frame)
+
+    return load(url, parse, key="trades", ttl=ttl, force=force)
+
+
+def load_live(url, ttl=DEFAULT_TTL, force=False, skip=LIVE_SKIP_ROWS, limit=LIVE_MAX_ROWS):
+    """
+    Cached, typed live-position sheet
+
+    Args:
+        url: Address of the live-position CSV export
+        ttl: Seconds a cached frame is served without revalidation
+        force: Revalidate now regardless of the TTL
+        skip: Rows under the header before the positions block
+        limit: Max positions rows (None for no limit)
+
+    Returns:
+        DataFrame normalized with schema.LIVE_SCHEMA
+    """
+    def parse(body):
+        # Locate the header by its columns instead of a fixed skiprows, so rows
+        # added above it don't matter; the bounds are remembered so the next
+        # parse only reads that range
+        with timing.span("live.read_region"):
+            frame, region = sheet_region.read_region(
+                body, list(schema.LIVE_SCHEMA), key_column="Stock", numeric_column="Invested Value",
+                region=_live_regions.get(url), skip=skip, limit=limit,
+            )
+        _live_regions[url] = region
+        with timing.span("live.normalize"):
+            return schema.normalize_live(frame)
+
+    return load(url, parse, key=("live", skip, limit), ttl=ttl, force=force)
+
+
+def live_region(url):
+    """Row bounds (header/start/stop) detected in the live sheet, or None before the first load"""
+    return _live_regions.get(url)
+
+
+def derived(frame, name, build):
+    """
+    Artifact built once per loaded frame (cube, index, ...) and reused until it changes
+
+    The loaders return the same frame object while the data is unchanged, so
+    the artifact is keyed on the frame's identity and dropped with it.
+
+    Args:
+        frame: Loaded DataFrame
+        name: Artifact name (hashable, may include parameters)
+        build: Callable taking the frame and returning the artifact
+
+    Returns:
+        The artifact
+    """
+    key = (id(frame), name)
+    with _lock:
+        hit = _derived.get(key)
+    if hit is not None and hit[0]() is frame:
+        return hit[1]
+
+    value = build(frame)
+    ref = weakref.ref(frame, lambda _, key=key: _derived.pop(key, None))
+    with _lock:
+        _derived[key] = (ref, value)
+    return value
+
+
+def refresh(url=None):
+    """Expire cached entries (all, or just one URL) so the next load revalidates"""
+    with _lock:
+        for (cached_url, _), entry in _cache.items():
+            if url is None or cached_url == url:
+                entry.fetched_at = float("-inf")
+
+
+def evict(url):
+    """Drop every cached entry (and detected live region) for a URL"""
+    with _lock:
+        for key in [key for key in _cache if key[0] == url]:
+            del _cache[key]
+        _live_regions.pop(url, None)
+
+
+def cache_info():
+    """Age and validators of every cached entry, for display/debugging"""
+    now = time.monotonic()
+    with _lock:
+        return [
+            {
+                "url": cached_url,
+                "rows": len(entry.frame),
+                "age_s": round(now - entry.fetched_at, 1),
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+            }
+            for (cached_url, _), entry in _cache.items()
+        ]